@@ -0,0 +1,59 @@
+"""Memory held by a day's worth of orders, slotted entities against plain dataclasses.
+
+Run from the repository root (the settings module needs the usual env vars):
+
+    python -m benchmarks.entity_memory_benchmark --orders 50000 --items 3
+"""
+import argparse
+import dataclasses
+import datetime
+import decimal
+import tracemalloc
+import uuid
+
+from src.entities.models.order_entity import Order
+from src.entities.models.order_item_entity import OrderItem
+
+
+def plain_dataclass(entity_cls: type) -> type:
+    # Same fields in the same order, but with a per-instance __dict__ like the entities used to have
+    return dataclasses.make_dataclass(
+        f"Plain{entity_cls.__name__}", [(field.name, field.type) for field in dataclasses.fields(entity_cls)]
+    )
+
+
+def build_orders(order_cls: type, item_cls: type, count: int, items_per_order: int) -> list:
+    creation_date = datetime.datetime.now()
+    total = decimal.Decimal("42.50")
+    orders = []
+    for _ in range(count):
+        order_id = uuid.uuid4()
+        items = [item_cls(order_id, uuid.uuid4(), 2) for _ in range(items_per_order)]
+        orders.append(order_cls(order_id, uuid.uuid4(), items, creation_date, total, "Confirmado", "Pendente"))
+    return orders
+
+
+def measure(order_cls: type, item_cls: type, count: int, items_per_order: int) -> float:
+    tracemalloc.start()
+    orders = build_orders(order_cls, item_cls, count, items_per_order)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--items", type=int, default=3)
+    args = parser.parse_args()
+
+    plain = measure(plain_dataclass(Order), plain_dataclass(OrderItem), args.orders, args.items)
+    slotted = measure(Order, OrderItem, args.orders, args.items)
+
+    print(f"plain dataclasses   {plain:8.0f} bytes/order")
+    print(f"slotted entities    {slotted:8.0f} bytes/order  ({(1 - slotted / plain) * 100:.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
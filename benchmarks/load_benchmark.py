@@ -0,0 +1,349 @@
+"""HTTP load test of the order lifecycle: kiosks placing and paying orders, kitchens working the queue.
+
+By default the harness starts a Mercado Pago stub and the app itself (``python -m src.server``) against the
+Postgres configured in the usual env vars, seeds a catalog through the API and drives traffic for a fixed
+duration. Point ``--base-url`` at an already running deployment to skip launching the app; that deployment
+must then be configured with ``MERCADO_PAGO_BASE_URL`` pointing at a running stub
+(``uvicorn benchmarks.mercado_pago_stub:app``).
+
+Run from the repository root:
+
+    python -m benchmarks.load_benchmark --create-schema --duration 60 --kiosks 20 --kitchens 2
+
+Per-endpoint RPS and p50/p95/p99 latencies are printed and written as JSON to ``--output``.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import pathlib
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+CATEGORIES = ("Lanche", "Acompanhamento", "Bebida", "Sobremesa")
+RESULTS_DIR = pathlib.Path(__file__).resolve().parent / "results"
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.completed_orders = 0
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            raise
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            samples = sorted(self.latencies[name])
+            endpoints[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "rps": round(len(samples) / elapsed, 2),
+                "meanMs": round(sum(samples) / len(samples) * 1000, 2) if samples else None,
+                "p50Ms": percentile(samples, 50),
+                "p95Ms": percentile(samples, 95),
+                "p99Ms": percentile(samples, 99),
+                "maxMs": round(samples[-1] * 1000, 2) if samples else None,
+            }
+        requests = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "totals": {
+                "requests": requests,
+                "errors": sum(self.errors.values()),
+                "rps": round(requests / elapsed, 2),
+                "completedOrders": self.completed_orders,
+            },
+            "endpoints": endpoints,
+        }
+
+
+def percentile(sorted_samples: List[float], pct: int) -> Optional[float]:
+    if not sorted_samples:
+        return None
+    # Nearest-rank, so p99 of a small sample is an observed latency rather than an interpolation
+    rank = max(int(-(-pct * len(sorted_samples) // 100)), 1)
+    return round(sorted_samples[rank - 1] * 1000, 2)
+
+
+async def seed_catalog(client: httpx.AsyncClient, recorder: Recorder, count: int) -> List[str]:
+    product_ids = []
+    for index in range(count):
+        response = await recorder.call(client, "POST /products", "POST", "/products", json={
+            "name": f"Produto {index}",
+            "description": "Carga de benchmark",
+            "category": CATEGORIES[index % len(CATEGORIES)],
+            "price": round(random.uniform(5, 40), 2),
+            "imageUrl": "https://example.com/produto.png",
+        })
+        response.raise_for_status()
+        product_ids.append(response.json()["result"]["productId"])
+
+    if not product_ids:
+        response = await recorder.call(client, "GET /products", "GET", "/products")
+        response.raise_for_status()
+        product_ids = [product["productId"] for product in response.json()["result"]]
+    if not product_ids:
+        raise SystemExit("The catalog is empty; seed it with --products")
+    return product_ids
+
+
+async def kiosk(
+    client: httpx.AsyncClient, recorder: Recorder, product_ids: List[str], items: int, stub_url: str, deadline: float
+) -> None:
+    while time.monotonic() < deadline:
+        try:
+            await kiosk_session(client, recorder, product_ids, items, stub_url)
+        except (httpx.HTTPError, KeyError, ValueError):
+            # A failed step abandons the order, like a customer walking away; it is already counted
+            continue
+
+
+async def kiosk_session(
+    client: httpx.AsyncClient, recorder: Recorder, product_ids: List[str], items: int, stub_url: str
+) -> None:
+    category = random.choice(CATEGORIES)
+    await recorder.call(client, "GET /products/category/{category}", "GET", f"/products/category/{category}")
+
+    response = await recorder.call(client, "POST /customers", "POST", "/customers", json={
+        "cpf": "".join(random.choices("0123456789", k=11)),
+        "firstName": "Cliente",
+        "lastName": "Benchmark",
+    })
+    response.raise_for_status()
+    customer_id = response.json()["result"]["customerId"]
+
+    response = await recorder.call(client, "POST /orders", "POST", "/orders", json={"customerId": customer_id})
+    response.raise_for_status()
+    order_id = response.json()["result"]["orderId"]
+
+    for product_id in random.sample(product_ids, min(items, len(product_ids))):
+        response = await recorder.call(
+            client, "POST /orders/{order_id}/items", "POST", f"/orders/{order_id}/items",
+            json={"productId": product_id, "productQuantity": random.randint(1, 3)},
+        )
+        response.raise_for_status()
+
+    response = await recorder.call(
+        client, "PUT /orders/{order_id}/checkout", "PUT", f"/orders/{order_id}/checkout"
+    )
+    response.raise_for_status()
+
+    # What Mercado Pago sends once the customer pays the QR code
+    response = await recorder.call(
+        client, "POST /webhook", "POST", "/webhook",
+        params={"id": order_id, "topic": "merchant_order"},
+        json={"resource": f"{stub_url}/merchant_orders/{order_id}"},
+    )
+    response.raise_for_status()
+
+
+async def kitchen(
+    client: httpx.AsyncClient, recorder: Recorder, station: int, stations: int, poll_interval: float, deadline: float
+) -> None:
+    transitions = {"Em preparo": "ready", "Pronto": "finalized"}
+    while time.monotonic() < deadline:
+        try:
+            response = await recorder.call(client, "GET /orders/ongoing", "GET", "/orders/ongoing")
+            response.raise_for_status()
+            orders = response.json()["result"]
+        except (httpx.HTTPError, KeyError, ValueError):
+            await asyncio.sleep(poll_interval)
+            continue
+
+        for order in orders:
+            # Each station owns a slice of the orders so two stations never race on the same one
+            if int(order["orderId"].replace("-", ""), 16) % stations != station:
+                continue
+
+            if order["orderStatus"] == "Confirmado" and order["paymentStatus"] == "Confirmado":
+                action = "in-progress"
+            else:
+                action = transitions.get(order["orderStatus"])
+            if not action:
+                continue
+
+            try:
+                response = await recorder.call(
+                    client, f"PUT /orders/{{order_id}}/{action}", "PUT", f"/orders/{order['orderId']}/{action}"
+                )
+            except httpx.HTTPError:
+                continue
+            if action == "finalized" and response.status_code < 400:
+                recorder.completed_orders += 1
+
+        await asyncio.sleep(poll_interval)
+
+
+async def wait_until_up(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise SystemExit(f"{url} did not come up within {timeout:.0f}s")
+            await asyncio.sleep(0.5)
+
+
+def start_process(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", *args], env={**os.environ, **env})
+
+
+def stop_process(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def create_schema() -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.config.config import settings
+    from src.external.postgresql_database import Base
+    import src.gateways.orm.customer_orm  # noqa: F401
+    import src.gateways.orm.order_orm  # noqa: F401
+    import src.gateways.orm.product_orm  # noqa: F401
+    import src.gateways.orm.webhook_inbox_orm  # noqa: F401
+
+    engine = create_async_engine(settings.db.SQLALCHEMY_DATABASE_URI)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_load(args: argparse.Namespace, base_url: str, stub_url: str) -> dict:
+    connections = args.kiosks + args.kitchens
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.request_timeout) as client:
+        # Seeding is setup, not part of the measured traffic
+        product_ids = await seed_catalog(client, Recorder(), args.products)
+        recorder = Recorder()
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(kiosk(client, recorder, product_ids, args.items, stub_url, deadline) for _ in range(args.kiosks)),
+            *(kitchen(client, recorder, station, args.kitchens, args.poll_interval, deadline)
+              for station in range(args.kitchens)),
+        )
+        elapsed = time.monotonic() - started
+
+    return {"durationSeconds": round(elapsed, 2), **recorder.report(elapsed)}
+
+
+def print_report(report: dict) -> None:
+    print(f"{'endpoint':<40} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, endpoint in report["endpoints"].items():
+        print(f"{name:<40} {endpoint['requests']:>9} {endpoint['errors']:>7} {endpoint['rps']:>9} "
+              f"{endpoint['p50Ms'] or '-':>9} {endpoint['p95Ms'] or '-':>9} {endpoint['p99Ms'] or '-':>9}")
+    totals = report["totals"]
+    print(f"{'total':<40} {totals['requests']:>9} {totals['errors']:>7} {totals['rps']:>9}")
+    print(f"completed orders: {totals['completedOrders']}")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    processes = []
+    stub_url = args.stub_url or f"http://127.0.0.1:{args.stub_port}"
+    base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+    try:
+        if not args.stub_url:
+            processes.append(start_process([
+                "uvicorn", "benchmarks.mercado_pago_stub:app",
+                "--port", str(args.stub_port), "--log-level", "warning",
+            ], {}))
+            await wait_until_up(f"{stub_url}/docs", args.startup_timeout)
+
+        if not args.base_url:
+            if args.create_schema:
+                await create_schema()
+            processes.append(start_process(["src.server"], {
+                "SERVER_HOST": "127.0.0.1",
+                "SERVER_PORT": str(args.port),
+                "SERVER_WORKERS": str(args.workers),
+                "MERCADO_PAGO_BASE_URL": stub_url,
+                "WEBHOOK_BASE_URL": base_url,
+            }))
+            await wait_until_up(f"{base_url}/health-check", args.startup_timeout)
+
+        return await run_load(args, base_url, stub_url)
+    finally:
+        for process in reversed(processes):
+            stop_process(process)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", help="benchmark a running app instead of starting one")
+    parser.add_argument("--stub-url", help="use a running Mercado Pago stub instead of starting one")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=8101)
+    parser.add_argument("--workers", type=int, default=0, help="app workers, 0 lets the launcher pick")
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables before starting")
+    parser.add_argument("--products", type=int, default=40, help="products to seed, 0 reuses the catalog")
+    parser.add_argument("--items", type=int, default=3, help="distinct products per order")
+    parser.add_argument("--kiosks", type=int, default=20)
+    parser.add_argument("--kitchens", type=int, default=2)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--request-timeout", type=float, default=30)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--output", type=pathlib.Path)
+    args = parser.parse_args()
+
+    started_at = datetime.datetime.utcnow()
+    report = asyncio.run(main_async(args))
+    results = {
+        "startedAt": started_at.isoformat(),
+        "revision": git_revision(),
+        "config": {
+            "workers": args.workers,
+            "products": args.products,
+            "items": args.items,
+            "kiosks": args.kiosks,
+            "kitchens": args.kitchens,
+            "pollInterval": args.poll_interval,
+            "duration": args.duration,
+        },
+        **report,
+    }
+
+    print_report(report)
+    output = args.output or RESULTS_DIR / f"load-{started_at:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
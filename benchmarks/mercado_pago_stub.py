@@ -0,0 +1,33 @@
+"""Just enough of the Mercado Pago API for the load benchmark.
+
+QR creation always succeeds, and every merchant order is reported closed and approved, using the
+merchant order id as the external reference. The harness therefore sends webhooks whose resource is
+``<stub>/merchant_orders/<order_id>``.
+"""
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+
+
+def create_stub_app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.post("/instore/orders/qr/seller/collectors/{user_id}/pos/{external_pos_id}/qrs")
+    async def create_qr(user_id: str, external_pos_id: str, request: Request) -> dict:
+        body = await request.json()
+        return {"in_store_order_id": str(uuid.uuid4()), "qr_data": f"stub-qr-{body['external_reference']}"}
+
+    @app.get("/merchant_orders/{merchant_order_id}")
+    async def get_merchant_order(merchant_order_id: str) -> dict:
+        return {
+            "id": merchant_order_id,
+            "status": "closed",
+            "external_reference": merchant_order_id,
+            "payments": [{"status": "approved"}],
+        }
+
+    return app
+
+
+app = create_stub_app()
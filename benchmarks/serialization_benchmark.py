@@ -0,0 +1,78 @@
+"""Throughput of the order adapters for large lists.
+
+Run from the repository root (the settings module needs the usual env vars):
+
+    python -m benchmarks.serialization_benchmark --orders 10000
+"""
+import argparse
+import datetime
+import decimal
+import json
+import timeit
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+from src.adapters.order_json_adapter import order_list_to_json, order_serializer
+from src.entities.models.order_entity import order_factory
+from src.entities.models.order_item_entity import order_item_factory
+from src.utils.utils import camel_string, entity_to_dict
+
+
+def legacy_camelize_dict(snake_dict):
+    new_dict = {}
+    for key, value in snake_dict.items():
+        new_key = camel_string(key)
+        if isinstance(value, list):
+            new_dict[new_key] = list(map(legacy_camelize_dict, value))
+        elif isinstance(value, dict):
+            new_dict[new_key] = legacy_camelize_dict(value)
+        else:
+            new_dict[new_key] = value
+    return new_dict
+
+
+def legacy_order_list_to_json(order_list):
+    result = []
+    for order in order_list:
+        order_dict = entity_to_dict(order)
+        items_list = order_dict.pop("order_items")
+        order_json = legacy_camelize_dict(order_dict)
+        order_json["orderItems"] = [legacy_camelize_dict(entity_to_dict(item)) for item in items_list]
+        result.append(order_json)
+    return result
+
+
+def build_orders(count: int, items_per_order: int):
+    orders = []
+    for _ in range(count):
+        order_id = uuid.uuid4()
+        items = [order_item_factory(order_id, uuid.uuid4(), 2) for _ in range(items_per_order)]
+        orders.append(order_factory(
+            order_id, uuid.uuid4(), items, datetime.datetime.now(), decimal.Decimal("42.50"), "Confirmado", "Pendente"
+        ))
+    return orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orders = build_orders(args.orders, args.items)
+
+    def legacy():
+        return json.dumps(jsonable_encoder({"result": legacy_order_list_to_json(orders)})).encode()
+
+    def serializer():
+        return order_serializer.dumps({"result": order_list_to_json(orders)})
+
+    for name, func in (("legacy camelize_dict + json", legacy), ("EntitySerializer + orjson", serializer)):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:<30} {best * 1000:9.1f} ms  {args.orders / best:12,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
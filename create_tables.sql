@@ -25,6 +25,8 @@ create table if not exists orders (
     payment_status varchar(30) not null
 );
 
+create index if not exists idx_orders_creation_date_order_id on orders (creation_date, order_id);
+
 create table if not exists order_items (
 	id serial primary key,
 	order_id uuid references orders(order_id) on delete cascade,
@@ -32,17 +34,68 @@ create table if not exists order_items (
 	product_quantity integer not null
 );
 
-alter table orders
-add constraint constraint_customer_id
-foreign key (customer_id)
-references customers (customer_id);
+-- Databases created before this index may hold several rows for the same product in one order.
+-- Fold each group into its lowest id, summing quantities so the stored order_total still adds up,
+-- then add the index that upsert_order_items' ON CONFLICT (order_id, product_id) relies on.
+-- Every step is a no-op on a clean database, and like the rest of the script safe to re-run.
+update order_items kept
+set product_quantity = duplicates.total_quantity
+from (
+	select min(id) as id, sum(product_quantity) as total_quantity
+	from order_items
+	group by order_id, product_id
+	having count(*) > 1
+) duplicates
+where kept.id = duplicates.id;
+
+delete from order_items duplicate
+using order_items kept
+where duplicate.order_id = kept.order_id
+	and duplicate.product_id = kept.product_id
+	and duplicate.id > kept.id;
+
+create unique index if not exists uq_order_items_order_id_product_id on order_items (order_id, product_id);
+
+create table if not exists webhook_inbox (
+	resource varchar(255) primary key,
+	topic varchar(30) not null,
+	status varchar(20) not null,
+	attempts integer not null default 0,
+	received_at timestamptz not null,
+	available_at timestamptz not null,
+	last_error varchar(255)
+);
+
+create index if not exists idx_webhook_inbox_status_available_at on webhook_inbox (status, available_at);
+
+-- Postgres has no "add constraint if not exists", so the foreign keys are only added when missing
+do $$
+begin
+	if not exists (
+		select 1 from pg_constraint where conrelid = 'orders'::regclass and conname = 'constraint_customer_id'
+	) then
+		alter table orders
+		add constraint constraint_customer_id
+		foreign key (customer_id)
+		references customers (customer_id);
+	end if;
 
-alter table order_items
-add constraint constraint_order_id
-foreign key (order_id)
-references orders (order_id);
+	if not exists (
+		select 1 from pg_constraint where conrelid = 'order_items'::regclass and conname = 'constraint_order_id'
+	) then
+		alter table order_items
+		add constraint constraint_order_id
+		foreign key (order_id)
+		references orders (order_id);
+	end if;
 
-alter table order_items
-add constraint constraint_product_id
-foreign key (product_id)
-references products (product_id);
\ No newline at end of file
+	if not exists (
+		select 1 from pg_constraint where conrelid = 'order_items'::regclass and conname = 'constraint_product_id'
+	) then
+		alter table order_items
+		add constraint constraint_product_id
+		foreign key (product_id)
+		references products (product_id);
+	end if;
+end
+$$;
@@ -1,13 +1,14 @@
 from typing import List
 
+from src.adapters.entity_serializer import EntitySerializer
 from src.entities.models.customer_entity import Customer
-from src.utils.utils import camelize_dict
+
+customer_serializer = EntitySerializer(Customer)
 
 
 def customer_to_json(customer: Customer):
-    return camelize_dict(customer.__dict__)
+    return customer_serializer.to_dict(customer)
 
 
 def customer_list_to_json(customer_list: List[Customer]):
-    return [camelize_dict(customer.__dict__) for customer in customer_list]
-
+    return customer_serializer.to_list(customer_list)
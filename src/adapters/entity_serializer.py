@@ -0,0 +1,42 @@
+import dataclasses
+import decimal
+import uuid
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+
+from src.utils.utils import camel_string
+
+
+def orjson_default(value: Any) -> Any:
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    # asyncpg hands back its own UUID subclass, which orjson only serializes natively as uuid.UUID
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError
+
+
+class EntitySerializer:
+    def __init__(self, entity_cls: type, nested: Optional[Dict[str, "EntitySerializer"]] = None) -> None:
+        names = [field.name for field in dataclasses.fields(entity_cls)]
+
+        # Camel-cased once per entity class, in field order so the output matches the response DTOs
+        self._keys = tuple(camel_string(name) for name in names)
+        getter = attrgetter(*names)
+        self._getter = getter if len(names) > 1 else lambda entity: (getter(entity),)
+        self._nested = tuple((camel_string(name), serializer) for name, serializer in (nested or {}).items())
+
+    def to_dict(self, entity: Any) -> dict:
+        result = dict(zip(self._keys, self._getter(entity)))
+        for key, serializer in self._nested:
+            result[key] = serializer.to_list(result[key] or ())
+        return result
+
+    def to_list(self, entities: Iterable[Any]) -> List[dict]:
+        return [self.to_dict(entity) for entity in entities]
+
+    @staticmethod
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default)
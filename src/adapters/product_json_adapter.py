@@ -1,12 +1,14 @@
 from typing import List
 
+from src.adapters.entity_serializer import EntitySerializer
 from src.entities.models.product_entity import Product
-from src.utils.utils import camelize_dict
+
+product_serializer = EntitySerializer(Product)
 
 
 def product_to_json(product: Product):
-    return camelize_dict(product.__dict__)
+    return product_serializer.to_dict(product)
 
 
 def product_list_to_json(product_list: List[Product]):
-    return [camelize_dict(product.__dict__) for product in product_list]
+    return product_serializer.to_list(product_list)
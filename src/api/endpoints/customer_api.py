@@ -1,9 +1,10 @@
 import uuid
-from typing import Any
+from typing import Any, Union
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
 from src.api.errors.api_errors import APIErrorMessage
+from src.api.responses.trusted_response import trusted_response
 from src.config.errors import RepositoryError, ResourceNotFound
 from src.controllers.customer_controller import CustomerController
 from src.entities.schemas.customer_dto import CustomerDTOResponse, CreateCustomerDTO, \
@@ -20,13 +21,13 @@ router = APIRouter(tags=["Customers"])
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def get_all_customers() -> dict:
+async def get_all_customers() -> Union[dict, Response]:
     try:
         result = await CustomerController.get_all_customers()
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return trusted_response(result)
 
 
 @router.get(
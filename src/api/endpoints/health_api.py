@@ -1,6 +1,13 @@
 from fastapi import APIRouter
 from starlette import status
 
+from src.controllers.webhook_controller import WebhookController
+from src.external.postgresql_database import get_pool_status, get_replica_status
+from src.gateways.memory_gateways.customer_cache_gateway import customer_cache
+from src.gateways.memory_gateways.kitchen_queue_gateway import kitchen_queue
+from src.gateways.memory_gateways.order_event_broker import order_events
+from src.gateways.memory_gateways.product_cache_gateway import catalog_cache
+
 router = APIRouter(tags=["Health Check"])
 
 
@@ -8,3 +15,39 @@ router = APIRouter(tags=["Health Check"])
             status_code=status.HTTP_200_OK)
 def health_check() -> dict:
     return {"result": "Service is online"}
+
+
+@router.get("/health-check/db-pool",
+            status_code=status.HTTP_200_OK)
+def db_pool_status() -> dict:
+    return {"result": get_pool_status()}
+
+
+@router.get("/health-check/db-replica",
+            status_code=status.HTTP_200_OK)
+def db_replica_status() -> dict:
+    return {"result": get_replica_status()}
+
+
+@router.get("/health-check/product-cache",
+            status_code=status.HTTP_200_OK)
+def product_cache_status() -> dict:
+    return {"result": catalog_cache.stats()}
+
+
+@router.get("/health-check/customer-cache",
+            status_code=status.HTTP_200_OK)
+def customer_cache_status() -> dict:
+    return {"result": customer_cache.stats()}
+
+
+@router.get("/health-check/kitchen-queue",
+            status_code=status.HTTP_200_OK)
+def kitchen_queue_status() -> dict:
+    return {"result": {**kitchen_queue.stats(), **order_events.stats()}}
+
+
+@router.get("/health-check/webhook-inbox",
+            status_code=status.HTTP_200_OK)
+async def webhook_inbox_status() -> dict:
+    return await WebhookController.get_inbox_stats()
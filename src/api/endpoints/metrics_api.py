@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from src.utils.metrics import render_metrics
+
+router = APIRouter(tags=["Health Check"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    # CONTENT_TYPE_LATEST already carries the charset, so it is set as a header rather than a media type
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -1,40 +1,113 @@
+import asyncio
 import uuid
-from fastapi import APIRouter, Request, status
+from typing import AsyncIterator, List, Optional, Union
+
+from fastapi import APIRouter, Query, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
 
 from src.api.errors.api_errors import APIErrorMessage
+from src.api.responses.trusted_response import trusted_response
 from src.config.errors import RepositoryError, ResourceNotFound, DomainError
 from src.controllers.order_controller import OrderController
+from src.controllers.webhook_controller import WebhookController
 from src.entities.errors.order_item_error import OrderItemError
 from src.entities.schemas.order_dto import OrderDTOListResponse, OrderDTOResponse, CreateOrderDTO, CreateOrderItemDTO, \
-    UpdateOrderItemDTO, RemoveOrderItemDTO, OrderWithQrCodeDTOResponse
+    UpdateOrderItemDTO, RemoveOrderItemDTO, OrderWithQrCodeDTOResponse, OrderDTOPageResponse, RemoveOrdersDTO, \
+    RemovedOrdersDTOResponse
 from src.external.mercado_pago_api import MercadoPagoAPI
 
 router = APIRouter()
 
 
-@router.post("/webhook", tags=["Webhook"])
+@router.post("/webhook", tags=["Webhook"], status_code=status.HTTP_202_ACCEPTED)
 async def payment_webhook(request: Request):
     json_req = await request.json()
     params = list(request.query_params.values())
 
-    await MercadoPagoAPI.check_payment_approval(json_req, params)
+    await WebhookController.receive_notification(json_req, params)
 
 
 @router.get(
     "/orders", tags=["Orders"],
-    response_model=OrderDTOListResponse,
+    response_model=OrderDTOPageResponse,
     status_code=status.HTTP_200_OK,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def get_all_orders() -> dict:
+async def get_all_orders(
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = None
+) -> Union[dict, Response]:
     try:
-        result = await OrderController.get_all_orders()
+        result = await OrderController.get_orders_page(limit, after)
+    except DomainError:
+        raise
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return trusted_response(result)
+
+
+@router.get(
+    "/orders/ongoing/stream", tags=["Orders"],
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={500: {"model": APIErrorMessage}}
+)
+async def stream_ongoing_orders() -> StreamingResponse:
+    events = OrderController.ongoing_orders_events()
+    # Taken before the response starts so a failing snapshot still becomes a proper error response
+    first_event, first_data = await events.__anext__()
+
+    async def server_sent_events() -> AsyncIterator[str]:
+        yield f"event: {first_event}\ndata: {first_data}\n\n"
+        async for event, data in events:
+            if event == "heartbeat":
+                yield ": heartbeat\n\n"
+            else:
+                yield f"event: {event}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        server_sent_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/orders/ongoing/stream")
+async def websocket_ongoing_orders(websocket: WebSocket) -> None:
+    await websocket.accept()
+
+    async def send_events() -> None:
+        async for _, data in OrderController.ongoing_orders_events():
+            await websocket.send_text(data)
+
+    async def wait_for_disconnect() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    # Screens rarely send anything, so the disconnect is watched for separately from the event stream
+    sender = asyncio.create_task(send_events())
+    receiver = asyncio.create_task(wait_for_disconnect())
+    done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    if sender in done:
+        code = status.WS_1011_INTERNAL_ERROR if sender.exception() else status.WS_1000_NORMAL_CLOSURE
+        await websocket.close(code=code)
+
+
+@router.get(
+    "/orders/export", tags=["Orders"],
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={500: {"model": APIErrorMessage}}
+)
+async def export_orders() -> StreamingResponse:
+    return StreamingResponse(OrderController.export_orders(), media_type="application/x-ndjson")
 
 
 @router.get(
@@ -45,13 +118,13 @@ async def get_all_orders() -> dict:
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def list_ongoing_orders() -> dict:
+async def list_ongoing_orders() -> Union[dict, Response]:
     try:
         result = await OrderController.list_ongoing_orders()
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return trusted_response(result)
 
 
 @router.get(
@@ -116,6 +189,28 @@ async def add_order_items(
     return result
 
 
+@router.post(
+    "/orders/{order_id}/items/batch", tags=["Order Items"],
+    response_model=OrderDTOResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"model": APIErrorMessage},
+               404: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def add_order_items_batch(
+    request: List[CreateOrderItemDTO],
+    order_id: uuid.UUID
+) -> dict:
+    try:
+        result = await OrderController.add_order_items_batch(request, order_id)
+    except DomainError:
+        raise OrderItemError.modification_blocked()
+    except Exception:
+        raise RepositoryError.save_operation_failed()
+
+    return result
+
+
 @router.put(
     "/orders/{order_id}/items",  tags=["Order Items"],
     response_model=OrderDTOResponse,
@@ -218,6 +313,42 @@ async def order_finalized(
     return result
 
 
+@router.delete(
+    "/orders", tags=["Orders"],
+    response_model=RemovedOrdersDTOResponse,
+    status_code=status.HTTP_200_OK,
+    responses={400: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def remove_orders(
+    request: RemoveOrdersDTO
+) -> dict:
+    try:
+        result = await OrderController.remove_orders(request)
+    except Exception:
+        raise RepositoryError.save_operation_failed()
+
+    return result
+
+
+@router.delete(
+    "/orders/abandoned", tags=["Orders"],
+    response_model=RemovedOrdersDTOResponse,
+    status_code=status.HTTP_200_OK,
+    responses={400: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def remove_abandoned_orders(
+    older_than_minutes: int = Query(60, ge=1)
+) -> dict:
+    try:
+        result = await OrderController.remove_abandoned_orders(older_than_minutes)
+    except Exception:
+        raise RepositoryError.save_operation_failed()
+
+    return result
+
+
 @router.delete(
     "/orders/{order_id}", tags=["Orders"],
     status_code=status.HTTP_200_OK,
@@ -1,8 +1,11 @@
 import uuid
+from typing import Union
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, Response, status
 
 from src.api.errors.api_errors import APIErrorMessage
+from src.api.responses.conditional_response import not_modified, with_etag
+from src.api.responses.trusted_response import trusted_response
 from src.config.errors import RepositoryError, ResourceNotFound
 from src.controllers.product_controller import ProductController
 from src.entities.schemas.product_dto import ProductDTOListResponse, ProductDTOResponse, CreateProductDTO, \
@@ -19,13 +22,20 @@ router = APIRouter(tags=["Products"])
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def get_all_products() -> dict:
+async def get_all_products(
+    request: Request,
+    response: Response
+) -> Union[dict, Response]:
     try:
+        etag = await ProductController.get_catalog_etag()
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
         result = await ProductController.get_all_products()
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return {"result": result}
+    return with_etag(trusted_response({"result": result}), response, etag)
 
 
 @router.get(
@@ -37,14 +47,20 @@ async def get_all_products() -> dict:
                500: {"model": APIErrorMessage}}
 )
 async def get_all_products_by_category(
-    product_category: str
-) -> dict:
+    product_category: str,
+    request: Request,
+    response: Response
+) -> Union[dict, Response]:
     try:
+        etag = await ProductController.get_catalog_etag(product_category)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
         result = await ProductController.get_all_products_by_category(product_category)
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return {"result": result}
+    return with_etag(trusted_response({"result": result}), response, etag)
 
 
 @router.get(
@@ -56,16 +72,21 @@ async def get_all_products_by_category(
                500: {"model": APIErrorMessage}}
 )
 async def get_product_by_id(
-    product_id: uuid.UUID
-) -> dict:
+    product_id: uuid.UUID,
+    request: Request,
+    response: Response
+) -> Union[dict, Response]:
     try:
-        result = await ProductController.get_product_by_id(product_id)
+        result, etag = await ProductController.get_product_by_id_with_etag(product_id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
     except ResourceNotFound:
         raise ResourceNotFound.get_operation_failed(f"No product with id: {product_id}")
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return {"result": result}
+    return with_etag({"result": result}, response, etag)
 
 
 @router.post(
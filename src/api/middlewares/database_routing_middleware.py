@@ -0,0 +1,21 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.external.postgresql_database import primary_pinned
+
+
+class DatabaseRoutingMiddleware:
+    """Starts every request reading from the replica; a write pins the rest of the request to the primary."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        token = primary_pinned.set(False)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            primary_pinned.reset(token)
@@ -0,0 +1,43 @@
+import time
+from typing import Callable, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """Counts and times every HTTP request, labelled with the route template so ids do not explode the series."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._route_paths: Optional[Dict[Callable, str]] = None
+
+    def route_path(self, scope: Scope) -> str:
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        # The router leaves the matched endpoint in the scope; unmatched paths share one label
+        return self._route_paths.get(scope.get("endpoint"), "unmatched")  # type: ignore
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            labels = (scope["method"], self.route_path(scope), status_code)
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - started)
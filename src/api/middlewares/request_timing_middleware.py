@@ -0,0 +1,45 @@
+import random
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.config import settings
+from src.utils.request_timing import RequestTiming, current_timing
+
+
+class RequestTimingMiddleware:
+    """Breaks sampled requests down by layer into a Server-Timing header and one JSON log line."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timing.server_timing())
+            await send(message)
+
+        token = current_timing.set(timing)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timing.reset(token)
+            print(orjson.dumps({
+                "event": "request_timing",
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "totalMs": round(timing.total() * 1000, 2),
+                "layersMs": {layer: round(elapsed * 1000, 2) for layer, elapsed in timing.layers.items()},
+                "sqlStatements": timing.sql_statements,
+            }).decode())
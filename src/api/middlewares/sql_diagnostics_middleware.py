@@ -0,0 +1,37 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config.config import settings
+from src.config.errors import NPlusOneQueryError
+from src.utils.sql_diagnostics import QueryDiagnostics, current_diagnostics, log_event
+
+
+class SqlDiagnosticsMiddleware:
+    """Flags requests that run the same statement more than N_PLUS_ONE_THRESHOLD times; raises in test mode."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        diagnostics = QueryDiagnostics(settings.N_PLUS_ONE_THRESHOLD)
+        token = current_diagnostics.set(diagnostics)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_diagnostics.reset(token)
+
+        for statement, operation in diagnostics.repeated.items():
+            log_event(
+                "n_plus_one",
+                method=scope["method"],
+                path=scope["path"],
+                count=diagnostics.counts[statement],
+                operation=operation,
+                statement=statement,
+            )
+        if diagnostics.repeated and settings.ENVIRONMENT == "test":
+            statement, operation = next(iter(diagnostics.repeated.items()))
+            raise NPlusOneQueryError.repeated_statement(statement, diagnostics.counts[statement], operation)
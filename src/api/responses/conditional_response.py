@@ -0,0 +1,35 @@
+from typing import Optional, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette import status
+
+from src.config.config import settings
+
+
+def cache_control() -> str:
+    return f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches
+    candidates = {candidate.strip().replace("W/", "", 1) for candidate in if_none_match.split(",")}
+    if etag not in candidates and "*" not in candidates:
+        return None
+
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control()},
+    )
+
+
+def with_etag(content: Union[dict, Response], response: Response, etag: str) -> Union[dict, Response]:
+    # A dict goes through the response model and picks up headers from the injected response
+    target = content if isinstance(content, Response) else response
+    target.headers["ETag"] = etag
+    target.headers["Cache-Control"] = cache_control()
+    return content
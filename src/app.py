@@ -1,7 +1,9 @@
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -10,14 +12,45 @@ from src.api.endpoints.customer_api import router as customers_router
 from src.api.endpoints.product_api import router as products_router
 from src.api.endpoints.order_api import router as orders_router
 from src.api.endpoints.health_api import router as health_router
+from src.api.endpoints.metrics_api import router as metrics_router
 from src.api.errors.api_errors import APIErrorMessage
+from src.api.middlewares.database_routing_middleware import DatabaseRoutingMiddleware
+from src.api.middlewares.metrics_middleware import MetricsMiddleware
+from src.api.middlewares.request_timing_middleware import RequestTimingMiddleware
+from src.api.middlewares.sql_diagnostics_middleware import SqlDiagnosticsMiddleware
+from src.config.config import settings
 from src.config.errors import DomainError, ResourceNotFound, RepositoryError
-
-app = FastAPI()
+from src.external.kitchen_queue_worker import kitchen_queue_reconciler
+from src.external.mercado_pago_api import MercadoPagoAPI
+from src.external.postgresql_database import engine, replica_engine
+from src.external.webhook_worker import webhook_workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await MercadoPagoAPI.open_client()
+    webhook_workers.start()
+    await kitchen_queue_reconciler.start()
+    yield
+    await kitchen_queue_reconciler.stop()
+    await webhook_workers.stop()
+    await MercadoPagoAPI.close_client()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(DatabaseRoutingMiddleware)
+if settings.SQL_DIAGNOSTICS:
+    app.add_middleware(SqlDiagnosticsMiddleware)
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(customers_router)
 app.include_router(products_router)
 app.include_router(orders_router)
 app.include_router(health_router)
+app.include_router(metrics_router)
 
 
 @app.exception_handler(DomainError)
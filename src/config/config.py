@@ -15,20 +15,45 @@ class PostgresDBSettings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_DB: str
 
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_TIMEOUT: int = 30
+
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn]
 
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_RETRY_SECONDS: int = 30
+
+    SQLALCHEMY_REPLICA_URI: Optional[PostgresDsn]
+
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
         if isinstance(v, str):
             return v
         return PostgresDsn.build(
-            scheme="postgresql",
+            scheme="postgresql+asyncpg",
             user=values.get("POSTGRES_USER"),
             password=values.get("POSTGRES_PASS"),
             host=values.get("POSTGRES_HOST"),
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    @validator("SQLALCHEMY_REPLICA_URI", pre=True)
+    def assemble_replica_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        if not values.get("POSTGRES_REPLICA_HOST"):
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            user=values.get("POSTGRES_USER"),
+            password=values.get("POSTGRES_PASS"),
+            host=values.get("POSTGRES_REPLICA_HOST"),
+            path=f"/{values.get('POSTGRES_DB') or ''}",
+        )
+
 
 class Settings(BaseSettings):
     ENVIRONMENT: str
@@ -36,6 +61,48 @@ class Settings(BaseSettings):
     MERCADO_PAGO_ACCESS_TOKEN: str
     MERCADO_PAGO_USER_ID: str
     MERCADO_PAGO_EXTERNAL_POS_ID: str
+    MERCADO_PAGO_BASE_URL: str = "https://api.mercadopago.com"
+    MERCADO_PAGO_CONNECT_TIMEOUT: float = 5.0
+    MERCADO_PAGO_READ_TIMEOUT: float = 10.0
+    MERCADO_PAGO_MAX_CONNECTIONS: int = 20
+    MERCADO_PAGO_MAX_RETRIES: int = 3
+    MERCADO_PAGO_RETRY_BACKOFF: float = 0.5
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_TIMEOUT: int = 60
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_KEEPALIVE: int = 5
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+
+    WEBHOOK_WORKERS: int = 2
+    WEBHOOK_BATCH_SIZE: int = 10
+    WEBHOOK_POLL_INTERVAL: float = 1.0
+    WEBHOOK_VISIBILITY_TIMEOUT: int = 60
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_RETRY_BACKOFF: float = 2.0
+    WEBHOOK_METRICS_INTERVAL: float = 15.0
+
+    REQUEST_TIMING_SAMPLE_RATE: float = 0.0
+    SQL_DIAGNOSTICS: bool = False
+    SLOW_QUERY_MS: float = 200
+    SLOW_QUERY_PARAMETERS_MAX_LENGTH: int = 500
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    TRUSTED_RESPONSES: bool = False
+    ORDER_EXPORT_BATCH_SIZE: int = 500
+    ORDER_BULK_DELETE_BATCH_SIZE: int = 500
+    PRODUCT_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 30
+    CUSTOMER_CACHE_MAX_SIZE: int = 10000
+    CUSTOMER_CACHE_TTL_SECONDS: float = 30
+    CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS: float = 5
+    KITCHEN_QUEUE_RECONCILE_SECONDS: int = 10
+    KITCHEN_QUEUE_MAX_AGE_SECONDS: int = 30
+    ORDER_STREAM_QUEUE_SIZE: int = 100
+    ORDER_STREAM_HEARTBEAT_SECONDS: int = 15
 
     db: PostgresDBSettings = PostgresDBSettings()
 
@@ -16,3 +16,9 @@ class RepositoryError(DomainError):
     @classmethod
     def get_operation_failed(cls) -> "RepositoryError":
         return cls("An error occurred while retrieving the data from the database!")
+
+
+class NPlusOneQueryError(Exception):
+    @classmethod
+    def repeated_statement(cls, statement: str, count: int, operation: str) -> "NPlusOneQueryError":
+        return cls(f"Statement ran {count} times in one request (last from {operation}): {statement}")
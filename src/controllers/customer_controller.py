@@ -4,18 +4,21 @@ from typing import Any
 from src.adapters.customer_json_adapter import customer_list_to_json, customer_to_json
 from src.config.errors import ResourceNotFound, RepositoryError
 from src.entities.schemas.customer_dto import CreateCustomerDTO, ChangeCustomerDTO
+from src.gateways.memory_gateways.customer_cache_gateway import CachedCustomerRepository
 from src.gateways.postgres_gateways.customer_gateway import PostgresDBCustomerRepository
 from src.usecases.customer_usecase import CustomerUseCase
+from src.utils.request_timing import instrument
 
 
+@instrument("controller")
 class CustomerController:
 
     @staticmethod
     async def get_all_customers() -> dict:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            all_customers = CustomerUseCase(customer_gateway).get_all()
+            all_customers = await CustomerUseCase(customer_gateway).get_all()
             if all_customers:
                 result = customer_list_to_json(all_customers)
             else:
@@ -29,10 +32,10 @@ class CustomerController:
     async def get_customer_by_cpf(
         cpf: str
     ) -> Any:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            customer = CustomerUseCase(customer_gateway).get_by_cpf(cpf)
+            customer = await CustomerUseCase(customer_gateway).get_by_cpf(cpf)
             result = customer_to_json(customer)
         except ResourceNotFound:
             raise ResourceNotFound.get_operation_failed(f"No customer with cpf: {cpf}")
@@ -45,10 +48,10 @@ class CustomerController:
     async def get_customer_by_id(
         customer_id: uuid.UUID
     ) -> dict:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            customer = CustomerUseCase(customer_gateway).get_by_id(customer_id)
+            customer = await CustomerUseCase(customer_gateway).get_by_id(customer_id)
             result = customer_to_json(customer)
         except ResourceNotFound:
             raise ResourceNotFound.get_operation_failed(f"No customer with id: {customer_id}")
@@ -61,10 +64,10 @@ class CustomerController:
     async def create_customer(
         request: CreateCustomerDTO
     ) -> dict:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            customer = CustomerUseCase(customer_gateway).create(request)
+            customer = await CustomerUseCase(customer_gateway).create(request)
             result = customer_to_json(customer)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -76,10 +79,10 @@ class CustomerController:
         customer_id: uuid.UUID,
         request: ChangeCustomerDTO
     ) -> dict:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            customer = CustomerUseCase(customer_gateway).update(customer_id, request)
+            customer = await CustomerUseCase(customer_gateway).update(customer_id, request)
             result = customer_to_json(customer)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -90,10 +93,10 @@ class CustomerController:
     async def remove_customer(
         customer_id: uuid.UUID
     ) -> dict:
-        customer_gateway = PostgresDBCustomerRepository()
+        customer_gateway = CachedCustomerRepository(PostgresDBCustomerRepository())
 
         try:
-            CustomerUseCase(customer_gateway).remove(customer_id)
+            await CustomerUseCase(customer_gateway).remove(customer_id)
         except Exception:
             raise RepositoryError.save_operation_failed()
 
@@ -1,58 +1,124 @@
+import asyncio
+import datetime
 import uuid
+from typing import AsyncIterator, List, Optional, Tuple
 
 from fastapi import APIRouter
 from sqlalchemy.orm import Session
 
 from src.adapters.order_json_adapter import order_list_to_json, order_to_json, order_item_to_json, \
-    order_item_list_to_json, order_with_qrcode_to_json
+    order_item_list_to_json, order_with_qrcode_to_json, order_serializer
+from src.config.config import settings
 from src.config.errors import RepositoryError, ResourceNotFound, DomainError
+from src.entities.errors.order_error import OrderError
 from src.entities.errors.order_item_error import OrderItemError
 from src.entities.models.order_entity import PaymentStatus
-from src.entities.schemas.order_dto import CreateOrderDTO, CreateOrderItemDTO, UpdateOrderItemDTO, RemoveOrderItemDTO
+from src.entities.schemas.order_dto import CreateOrderDTO, CreateOrderItemDTO, UpdateOrderItemDTO, RemoveOrderItemDTO, \
+    RemoveOrdersDTO
 from src.gateways.orm.order_orm import Orders, Order_Items
+from src.gateways.memory_gateways.kitchen_queue_gateway import KitchenQueueRepository
+from src.gateways.memory_gateways.order_event_broker import order_events
+from src.gateways.memory_gateways.product_cache_gateway import CachedProductRepository
 from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
 from src.gateways.postgres_gateways.product_gateway import PostgresDBProductRepository
+from src.gateways.postgres_gateways.unit_of_work import PostgresDBUnitOfWork
 from src.usecases.order_usecase import OrderUseCase
+from src.utils.request_timing import instrument
+from src.utils.utils import decode_cursor, encode_cursor
 
 router = APIRouter()
 
 
+@instrument("controller")
 class OrderController:
     @staticmethod
-    async def get_all_orders() -> dict:
+    async def get_orders_page(
+        limit: int,
+        after: Optional[str] = None
+    ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
+
+        after_key = None
+        if after:
+            after_key = decode_cursor(after)
+            if not after_key:
+                raise OrderError.invalid_cursor()
 
         try:
-            all_orders = OrderUseCase(order_gateway, product_gateway).get_all()
-            result = order_list_to_json(all_orders)
+            orders = await order_usecase.get_page(limit, after_key)
+            next_cursor = None
+            if len(orders) == limit:
+                next_cursor = encode_cursor(orders[-1].creation_date, orders[-1].order_id)
+            result = order_list_to_json(orders)
         except Exception:
             raise RepositoryError.get_operation_failed()
 
-        return {"result": result}
+        return {"result": result, "nextCursor": next_cursor}
+
+    @staticmethod
+    async def export_orders() -> AsyncIterator[bytes]:
+        order_gateway = PostgresDBOrderRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
+
+        async for order in order_usecase.stream_all():
+            yield order_serializer.dumps(order_to_json(order)) + b"\n"
 
     @staticmethod
     async def list_ongoing_orders() -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            ongoing_orders = OrderUseCase(order_gateway, product_gateway).list_ongoing_orders()
+            ongoing_orders = await order_usecase.list_ongoing_orders()
             result = order_list_to_json(ongoing_orders)
         except Exception:
             raise RepositoryError.get_operation_failed()
 
         return {"result": result}
 
+    @staticmethod
+    async def ongoing_orders_events() -> AsyncIterator[Tuple[str, str]]:
+        subscriber = order_events.subscribe()
+        try:
+            # Subscribed before the snapshot so no transition can fall in between
+            snapshot = await OrderController.list_ongoing_orders()
+            yield "snapshot", order_serializer.dumps({"event": "snapshot", **snapshot}).decode()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), settings.ORDER_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield "heartbeat", order_serializer.dumps({"event": "heartbeat"}).decode()
+                    continue
+
+                if event is None:
+                    return
+                yield event
+        finally:
+            order_events.unsubscribe(subscriber)
+
     @staticmethod
     async def get_order_by_id(
         order_id: uuid.UUID
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).get_by_id(order_id)
+            order = await order_usecase.get_by_id(order_id)
             result = order_to_json(order)
         except ResourceNotFound:
             raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
@@ -66,10 +132,13 @@ class OrderController:
         request: CreateOrderDTO
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).create_order(request)
+            order = await order_usecase.create_order(request)
             print(order)
             result = order_to_json(order)
         except Exception as e:
@@ -83,10 +152,13 @@ class OrderController:
         order_id: uuid.UUID,
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).create_order_item(order_id, request)
+            order = await order_usecase.create_order_item(order_id, request)
             result = order_to_json(order)
         except DomainError:
             raise OrderItemError.modification_blocked()
@@ -96,16 +168,40 @@ class OrderController:
 
         return {"result": result}
 
+    @staticmethod
+    async def add_order_items_batch(
+        request: List[CreateOrderItemDTO],
+        order_id: uuid.UUID,
+    ) -> dict:
+        order_gateway = PostgresDBOrderRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
+
+        try:
+            order = await order_usecase.create_order_items(order_id, request)
+            result = order_to_json(order)
+        except DomainError:
+            raise OrderItemError.modification_blocked()
+        except Exception:
+            raise RepositoryError.save_operation_failed()
+
+        return {"result": result}
+
     @staticmethod
     async def change_order_item_quantity(
         order_id: uuid.UUID,
         request: UpdateOrderItemDTO
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).update_quantity(order_id, request)
+            order = await order_usecase.update_quantity(order_id, request)
             result = order_to_json(order)
         except DomainError:
             raise OrderItemError.modification_blocked()
@@ -120,10 +216,13 @@ class OrderController:
         qr_code: str
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).confirm_order(order_id)
+            order = await order_usecase.confirm_order(order_id)
             result = order_with_qrcode_to_json(order, qr_code)
 
         except Exception:
@@ -137,11 +236,16 @@ class OrderController:
         status: str
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).confirm_payment(order_id, status)
+            order = await order_usecase.confirm_payment(order_id, status)
             result = order_to_json(order)
+        except DomainError:
+            raise
         except Exception:
             raise RepositoryError.save_operation_failed()
 
@@ -152,10 +256,13 @@ class OrderController:
         order_id: uuid.UUID
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).change_order_status_in_progress(order_id)
+            order = await order_usecase.change_order_status_in_progress(order_id)
             result = order_to_json(order)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -167,10 +274,13 @@ class OrderController:
         order_id: uuid.UUID
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).change_order_status_ready(order_id)
+            order = await order_usecase.change_order_status_ready(order_id)
             result = order_to_json(order)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -182,10 +292,13 @@ class OrderController:
         order_id: uuid.UUID
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            order = OrderUseCase(order_gateway, product_gateway).change_order_status_finalized(order_id)
+            order = await order_usecase.change_order_status_finalized(order_id)
             result = order_to_json(order)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -197,9 +310,12 @@ class OrderController:
         order_id: uuid.UUID
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
         try:
-            OrderUseCase(order_gateway, product_gateway).remove_order(order_id)
+            await order_usecase.remove_order(order_id)
         except DomainError:
             raise OrderItemError.modification_blocked()
         except Exception:
@@ -207,16 +323,53 @@ class OrderController:
 
         return {"result": "Order removed successfully"}
 
+    @staticmethod
+    async def remove_orders(
+        request: RemoveOrdersDTO
+    ) -> dict:
+        order_gateway = PostgresDBOrderRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
+        try:
+            removed = await order_usecase.remove_orders(request.order_ids)
+        except Exception:
+            raise RepositoryError.save_operation_failed()
+
+        return {"result": {"removedCount": len(removed)}}
+
+    @staticmethod
+    async def remove_abandoned_orders(
+        older_than_minutes: int
+    ) -> dict:
+        order_gateway = PostgresDBOrderRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
+        try:
+            removed_count = await order_usecase.remove_abandoned_orders(
+                datetime.timedelta(minutes=older_than_minutes)
+            )
+        except Exception:
+            raise RepositoryError.save_operation_failed()
+
+        return {"result": {"removedCount": removed_count}}
+
     @staticmethod
     async def remove_order_item(
         order_id: uuid.UUID,
         request: RemoveOrderItemDTO
     ) -> dict:
         order_gateway = PostgresDBOrderRepository()
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        unit_of_work = PostgresDBUnitOfWork()
+        kitchen_queue = KitchenQueueRepository(order_gateway)
+        order_usecase = OrderUseCase(order_gateway, product_gateway, unit_of_work, kitchen_queue)
 
         try:
-            OrderUseCase(order_gateway, product_gateway).remove_order_item(order_id, request.product_id)
+            await order_usecase.remove_order_item(order_id, request.product_id)
         except DomainError:
             raise OrderItemError.modification_blocked()
         except Exception:
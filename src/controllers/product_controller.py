@@ -1,25 +1,29 @@
 import uuid
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter
 
 from src.adapters.product_json_adapter import product_list_to_json, product_to_json
 from src.config.errors import RepositoryError, ResourceNotFound
 from src.entities.schemas.product_dto import CreateProductDTO, ChangeProductDTO
+from src.gateways.memory_gateways.product_cache_gateway import CachedProductRepository
 from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
 from src.gateways.postgres_gateways.product_gateway import PostgresDBProductRepository
 from src.usecases.product_usecase import ProductUseCase
+from src.utils.request_timing import instrument
 
 router = APIRouter(tags=["Products"])
 
 
+@instrument("controller")
 class ProductController:
     @staticmethod
     async def get_all_products() -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            all_products = ProductUseCase(order_gateway, product_gateway).get_all()
+            all_products = await ProductUseCase(order_gateway, product_gateway).get_all()
             result = product_list_to_json(all_products)
         except Exception:
             raise RepositoryError.get_operation_failed()
@@ -30,11 +34,11 @@ class ProductController:
     async def get_all_products_by_category(
         product_category: str
     ) -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            all_products = ProductUseCase(order_gateway, product_gateway).get_all_by_category(product_category)
+            all_products = await ProductUseCase(order_gateway, product_gateway).get_all_by_category(product_category)
             result = product_list_to_json(all_products)
         except Exception:
             raise RepositoryError.get_operation_failed()
@@ -45,11 +49,11 @@ class ProductController:
     async def get_product_by_id(
         product_id: uuid.UUID
     ) -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            product = ProductUseCase(order_gateway, product_gateway).get_by_id(product_id)
+            product = await ProductUseCase(order_gateway, product_gateway).get_by_id(product_id)
             result = product_to_json(product)
         except ResourceNotFound:
             raise ResourceNotFound.get_operation_failed(f"No product with id: {product_id}")
@@ -58,15 +62,61 @@ class ProductController:
 
         return result
 
+    @staticmethod
+    async def get_catalog_etag(
+        product_category: Optional[str] = None
+    ) -> str:
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        order_gateway = PostgresDBOrderRepository()
+
+        try:
+            result = await ProductUseCase(order_gateway, product_gateway).get_catalog_etag(product_category)
+        except Exception:
+            raise RepositoryError.get_operation_failed()
+
+        return result
+
+    @staticmethod
+    async def get_product_by_id_with_etag(
+        product_id: uuid.UUID
+    ) -> Tuple[dict, str]:
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        order_gateway = PostgresDBOrderRepository()
+
+        try:
+            product, etag = await ProductUseCase(order_gateway, product_gateway).get_by_id_with_etag(product_id)
+            result = product_to_json(product)
+        except ResourceNotFound:
+            raise ResourceNotFound.get_operation_failed(f"No product with id: {product_id}")
+        except Exception:
+            raise RepositoryError.get_operation_failed()
+
+        return result, etag
+
+    @staticmethod
+    async def get_products_by_ids(
+        product_ids: List[uuid.UUID]
+    ) -> list:
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
+        order_gateway = PostgresDBOrderRepository()
+
+        try:
+            products = await ProductUseCase(order_gateway, product_gateway).get_by_ids(product_ids)
+            result = product_list_to_json(products)
+        except Exception:
+            raise RepositoryError.get_operation_failed()
+
+        return result
+
     @staticmethod
     async def create_product(
         request: CreateProductDTO
     ) -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            product = ProductUseCase(order_gateway, product_gateway).create(request)
+            product = await ProductUseCase(order_gateway, product_gateway).create(request)
             result = product_to_json(product)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -78,11 +128,11 @@ class ProductController:
         product_id: uuid.UUID,
         request: ChangeProductDTO
     ) -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            product = ProductUseCase(order_gateway, product_gateway).update(product_id, request)
+            product = await ProductUseCase(order_gateway, product_gateway).update(product_id, request)
             result = product_to_json(product)
         except Exception:
             raise RepositoryError.save_operation_failed()
@@ -93,11 +143,11 @@ class ProductController:
     async def remove_product(
         product_id: uuid.UUID
     ) -> dict:
-        product_gateway = PostgresDBProductRepository()
+        product_gateway = CachedProductRepository(PostgresDBProductRepository())
         order_gateway = PostgresDBOrderRepository()
 
         try:
-            ProductUseCase(order_gateway, product_gateway).remove(product_id)
+            await ProductUseCase(order_gateway, product_gateway).remove(product_id)
         except Exception:
             raise RepositoryError.save_operation_failed()
 
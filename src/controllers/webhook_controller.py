@@ -0,0 +1,33 @@
+from src.config.errors import RepositoryError
+from src.external.mercado_pago_api import MercadoPagoAPI
+from src.gateways.postgres_gateways.webhook_inbox_gateway import PostgresDBWebhookInboxRepository
+from src.utils.metrics import WEBHOOK_NOTIFICATIONS
+from src.utils.request_timing import instrument
+
+
+@instrument("controller")
+class WebhookController:
+    @staticmethod
+    async def receive_notification(json_req: dict, params: list) -> None:
+        if len(params) < 2 or params[1] != "merchant_order":
+            return
+
+        resource = MercadoPagoAPI.merchant_order_path(str(json_req.get("resource", "")))
+        inbox_gateway = PostgresDBWebhookInboxRepository()
+
+        try:
+            await inbox_gateway.enqueue(params[1], resource)
+        except Exception:
+            raise RepositoryError.save_operation_failed()
+        WEBHOOK_NOTIFICATIONS.labels("received").inc()
+
+    @staticmethod
+    async def get_inbox_stats() -> dict:
+        inbox_gateway = PostgresDBWebhookInboxRepository()
+
+        try:
+            result = await inbox_gateway.stats()
+        except Exception:
+            raise RepositoryError.get_operation_failed()
+
+        return {"result": result}
@@ -5,3 +5,7 @@ class OrderError(DomainError):
     @classmethod
     def invalid_category(cls) -> "OrderError":
         return cls("Provided order is not valid!")
+
+    @classmethod
+    def invalid_cursor(cls) -> "OrderError":
+        return cls("Provided pagination cursor is not valid!")
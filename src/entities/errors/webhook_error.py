@@ -0,0 +1,7 @@
+from src.config.errors import DomainError
+
+
+class WebhookError(DomainError):
+    @classmethod
+    def invalid_resource(cls) -> "WebhookError":
+        return cls("Provided notification resource is not a merchant order!")
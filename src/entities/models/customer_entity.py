@@ -4,6 +4,8 @@ from dataclasses import dataclass
 
 @dataclass
 class Customer:
+    __slots__ = ("customer_id", "cpf", "first_name", "last_name", "email", "phone")
+
     customer_id: uuid.UUID
     cpf: str
     first_name: str
@@ -24,6 +24,16 @@ class PaymentStatus:
 
 @dataclass
 class Order:
+    __slots__ = (
+        "order_id",
+        "customer_id",
+        "order_items",
+        "creation_date",
+        "order_total",
+        "order_status",
+        "payment_status",
+    )
+
     order_id: uuid.UUID
     customer_id: uuid.UUID
     order_items: List[OrderItem]
@@ -6,6 +6,8 @@ from src.entities.errors.order_item_error import OrderItemError
 
 @dataclass
 class OrderItem:
+    __slots__ = ("order_id", "product_id", "product_quantity")
+
     order_id: uuid.UUID
     product_id: uuid.UUID
     product_quantity: int
@@ -14,6 +14,8 @@ class Category(Enum):
 
 @dataclass
 class Product:
+    __slots__ = ("product_id", "name", "description", "category", "price", "image_url")
+
     product_id: uuid.UUID
     name: str
     description: str
@@ -0,0 +1,27 @@
+import datetime
+from dataclasses import dataclass
+
+
+class NotificationStatus:
+    PENDING = "pending"
+    DONE = "done"
+    # The merchant order was not closed yet; a later notification for it is processed again
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+@dataclass
+class WebhookNotification:
+    resource: str
+    topic: str
+    received_at: datetime.datetime
+    attempts: int
+
+
+def webhook_notification_factory(
+    resource: str,
+    topic: str,
+    received_at: datetime.datetime,
+    attempts: int
+) -> WebhookNotification:
+    return WebhookNotification(resource=resource, topic=topic, received_at=received_at, attempts=attempts)
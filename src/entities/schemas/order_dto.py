@@ -57,6 +57,25 @@ class RemoveOrderItemDTO(CamelModel):
         }
 
 
+class RemoveOrdersDTO(CamelModel):
+    order_ids: List[uuid.UUID]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "order_ids": ["00000000-0000-0000-0000-000000000000"],
+            }
+        }
+
+
+class RemovedOrdersDTO(CamelModel):
+    removed_count: int
+
+
+class RemovedOrdersDTOResponse(CamelModel):
+    result: RemovedOrdersDTO
+
+
 class OrderItemDTOResponse(CamelModel):
     result: OrderItemsDTO
 
@@ -120,3 +139,8 @@ class OrderWithQrCodeDTOResponse(CamelModel):
 
 class OrderDTOListResponse(CamelModel):
     result: List[OrderDTO]
+
+
+class OrderDTOPageResponse(CamelModel):
+    result: List[OrderDTO]
+    next_cursor: Optional[str]
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Optional
+
+from src.config.config import settings
+from src.gateways.memory_gateways.kitchen_queue_gateway import KitchenQueueRepository
+from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
+
+
+class KitchenQueueReconciler:
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        self._stopping = asyncio.Event()
+        await self._reconcile()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._stopping is None:
+            return
+
+        self._stopping.set()
+        await asyncio.gather(self._task, return_exceptions=True)  # type: ignore
+        self._task = None
+        self._stopping = None
+
+    async def _run(self) -> None:
+        stopping = self._stopping
+
+        while not stopping.is_set():  # type: ignore
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.KITCHEN_QUEUE_RECONCILE_SECONDS)  # type: ignore
+            except asyncio.TimeoutError:
+                await self._reconcile()
+
+    @staticmethod
+    async def _reconcile() -> None:
+        try:
+            await KitchenQueueRepository(PostgresDBOrderRepository()).reconcile()
+        except Exception as er:
+            print(er)
+
+
+kitchen_queue_reconciler = KitchenQueueReconciler()
@@ -1,9 +1,13 @@
-from typing import Generator, Dict, Any
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Dict, Any, Iterator, Optional
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from src.config.config import settings
+from src.utils.request_timing import instrument_engine
+from src.utils.sql_diagnostics import install_sql_diagnostics
 
 
 class_registry: Dict = {}
@@ -22,16 +26,91 @@ class Base:
 
 connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
 
-engine = create_engine(
-    connection_uri
+engine = create_async_engine(
+    connection_uri,
+    pool_size=settings.db.POSTGRES_POOL_SIZE,
+    max_overflow=settings.db.POSTGRES_MAX_OVERFLOW,
+    pool_recycle=settings.db.POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=settings.db.POSTGRES_POOL_PRE_PING,
+    pool_timeout=settings.db.POSTGRES_POOL_TIMEOUT,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+instrument_engine(engine, "primary")
+if settings.SQL_DIAGNOSTICS:
+    install_sql_diagnostics(engine)
 
+replica_uri = settings.db.SQLALCHEMY_REPLICA_URI
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    db.current_user_id = None
+replica_engine = create_async_engine(
+    replica_uri,
+    pool_size=settings.db.POSTGRES_POOL_SIZE,
+    max_overflow=settings.db.POSTGRES_MAX_OVERFLOW,
+    pool_recycle=settings.db.POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=settings.db.POSTGRES_POOL_PRE_PING,
+    pool_timeout=settings.db.POSTGRES_POOL_TIMEOUT,
+) if replica_uri else None
+ReplicaSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=replica_engine
+) if replica_engine else None
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+    if settings.SQL_DIAGNOSTICS:
+        install_sql_diagnostics(replica_engine)
+
+# Set once the current request (or task) has written, so its later reads see that write
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+_replica_down_until: Optional[float] = None
+
+
+def pin_primary() -> None:
+    primary_pinned.set(True)
+
+
+@contextmanager
+def reading_from_primary() -> Iterator[None]:
+    token = primary_pinned.set(True)
     try:
-        yield db
+        yield
     finally:
-        db.close()
+        primary_pinned.reset(token)
+
+
+def replica_available() -> bool:
+    if ReplicaSessionLocal is None or primary_pinned.get():
+        return False
+    return _replica_down_until is None or time.monotonic() >= _replica_down_until
+
+
+def mark_replica_down() -> None:
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + settings.db.POSTGRES_REPLICA_RETRY_SECONDS
+
+
+def mark_replica_up() -> None:
+    global _replica_down_until
+    _replica_down_until = None
+
+
+def get_pool_status() -> Dict[str, int]:
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),  # type: ignore
+        "checkedIn": pool.checkedin(),  # type: ignore
+        "checkedOut": pool.checkedout(),  # type: ignore
+        "overflow": max(pool.overflow(), 0),  # type: ignore
+        "maxOverflow": settings.db.POSTGRES_MAX_OVERFLOW,
+    }
+
+
+def get_replica_status() -> Dict[str, Any]:
+    return {
+        "configured": replica_engine is not None,
+        "available": replica_engine is not None and (
+            _replica_down_until is None or time.monotonic() >= _replica_down_until
+        ),
+    }
+
+
+async def get_db() -> AsyncGenerator:
+    async with SessionLocal() as db:
+        yield db
@@ -0,0 +1,108 @@
+import asyncio
+from typing import List, Optional
+
+import httpx
+
+from src.config.config import settings
+from src.config.errors import RepositoryError
+from src.external.mercado_pago_api import MercadoPagoAPI
+from src.gateways.postgres_gateways.webhook_inbox_gateway import PostgresDBWebhookInboxRepository
+from src.interfaces.gateways.webhook_inbox_gateway_interface import IWebhookInboxGateway
+from src.utils.metrics import WEBHOOK_INBOX_DEPTH, WEBHOOK_INBOX_FAILED, WEBHOOK_INBOX_LAG, WEBHOOK_NOTIFICATIONS
+
+
+def is_retryable(er: Exception) -> bool:
+    # Only failures of the network, of Mercado Pago or of our database can clear up on a later attempt;
+    # RepositoryError is what the controllers raise when the database call itself failed
+    if isinstance(er, httpx.HTTPStatusError):
+        return er.response.status_code >= 500 or er.response.status_code == 429
+    return isinstance(er, (httpx.TransportError, RepositoryError))
+
+
+class WebhookWorkerPool:
+    def __init__(self) -> None:
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        self._stopping = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(settings.WEBHOOK_WORKERS)]
+        self._tasks.append(asyncio.create_task(self._report()))
+
+    async def stop(self) -> None:
+        if self._stopping is None:
+            return
+
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._stopping = None
+
+    async def _run(self) -> None:
+        inbox_gateway = PostgresDBWebhookInboxRepository()
+        stopping = self._stopping
+
+        while not stopping.is_set():  # type: ignore
+            try:
+                processed = await self.process_batch(inbox_gateway)
+            except Exception as er:
+                print(er)
+                processed = 0
+
+            if not processed:
+                try:
+                    await asyncio.wait_for(stopping.wait(), settings.WEBHOOK_POLL_INTERVAL)  # type: ignore
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _report(self) -> None:
+        inbox_gateway = PostgresDBWebhookInboxRepository()
+        stopping = self._stopping
+
+        while not stopping.is_set():  # type: ignore
+            try:
+                await self.report_inbox(inbox_gateway)
+            except Exception as er:
+                print(er)
+
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.WEBHOOK_METRICS_INTERVAL)  # type: ignore
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def report_inbox(inbox_gateway: IWebhookInboxGateway) -> None:
+        stats = await inbox_gateway.stats()
+        WEBHOOK_INBOX_DEPTH.set(stats["depth"])
+        WEBHOOK_INBOX_LAG.set(stats["lagSeconds"])
+        WEBHOOK_INBOX_FAILED.set(stats["failed"])
+
+    @staticmethod
+    async def process_batch(inbox_gateway: IWebhookInboxGateway) -> int:
+        notifications = await inbox_gateway.claim(settings.WEBHOOK_BATCH_SIZE, settings.WEBHOOK_VISIBILITY_TIMEOUT)
+
+        for notification in notifications:
+            try:
+                settled = await MercadoPagoAPI.process_merchant_order(notification.resource)
+            except Exception as er:
+                error = str(er) or er.__class__.__name__
+                # An unknown or already paid order, or a 4xx from Mercado Pago, fails the same way every time
+                if not is_retryable(er) or notification.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                    await inbox_gateway.fail(notification, error)
+                    WEBHOOK_NOTIFICATIONS.labels("failed").inc()
+                else:
+                    delay = settings.WEBHOOK_RETRY_BACKOFF * 2 ** (notification.attempts - 1)
+                    await inbox_gateway.retry(notification, delay, error)
+                    WEBHOOK_NOTIFICATIONS.labels("retried").inc()
+            else:
+                if settled:
+                    await inbox_gateway.complete(notification)
+                    WEBHOOK_NOTIFICATIONS.labels("completed").inc()
+                else:
+                    await inbox_gateway.skip(notification)
+                    WEBHOOK_NOTIFICATIONS.labels("skipped").inc()
+
+        return len(notifications)
+
+
+webhook_workers = WebhookWorkerPool()
@@ -0,0 +1,162 @@
+import copy
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config.config import settings
+from src.entities.models.customer_entity import Customer
+from src.interfaces.gateways.customer_gateway_interface import ICustomerGateway
+from src.utils.request_timing import instrument
+
+
+class CustomerCpfCache:
+    """CPF lookups cached per process.
+
+    Writes made through this process invalidate their entries at once. Writes made by another worker or
+    replica are only seen once the entry expires, so ttl_seconds bounds how stale a cached customer can be
+    and negative_ttl_seconds how long a newly created one can still be reported missing.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, negative_ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        # Bumped on every invalidation, so a lookup that raced a write does not cache what it read
+        self.version = 0
+        # CPF -> (customer, monotonic expiry), least recently used first
+        self._customers: "OrderedDict[str, Tuple[Customer, float]]" = OrderedDict()
+        self._cpf_by_id: Dict[uuid.UUID, str] = {}
+        # CPF -> monotonic expiry of the "no such customer" answer
+        self._missing: Dict[str, float] = {}
+
+    def get(self, cpf: str) -> Optional[Customer]:
+        entry = self._customers.get(cpf)
+        if entry is None:
+            return None
+        customer, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._drop(cpf)
+            return None
+        self._customers.move_to_end(cpf)
+        return copy.copy(customer)
+
+    def is_missing(self, cpf: str) -> bool:
+        expires_at = self._missing.get(cpf)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self._missing[cpf]
+            return False
+        return True
+
+    def put(self, customer: Customer, version: int) -> None:
+        if not customer.cpf or self.max_size <= 0 or self.ttl_seconds <= 0 or version != self.version:
+            return
+        self._missing.pop(customer.cpf, None)
+        self._customers[customer.cpf] = (copy.copy(customer), time.monotonic() + self.ttl_seconds)
+        self._customers.move_to_end(customer.cpf)
+        self._cpf_by_id[customer.customer_id] = customer.cpf
+        while len(self._customers) > self.max_size:
+            _, (evicted, _) = self._customers.popitem(last=False)
+            self._cpf_by_id.pop(evicted.customer_id, None)
+
+    def put_missing(self, cpf: str, version: int) -> None:
+        # A create that committed while the lookup was running must not be hidden behind a stale miss
+        if self.negative_ttl_seconds <= 0 or version != self.version:
+            return
+        # Expired entries are only dropped on lookup, so purge them before the dict outgrows the LRU
+        if len(self._missing) >= self.max_size:
+            now = time.monotonic()
+            self._missing = {key: expires_at for key, expires_at in self._missing.items() if expires_at > now}
+            if len(self._missing) >= self.max_size:
+                self._missing.pop(next(iter(self._missing)))
+        self._missing[cpf] = time.monotonic() + self.negative_ttl_seconds
+
+    def invalidate(self, cpf: Optional[str] = None, customer_id: Optional[uuid.UUID] = None) -> None:
+        self.version += 1
+        if customer_id is not None:
+            cpf = self._cpf_by_id.pop(customer_id, None) or cpf
+        if cpf:
+            self._drop(cpf)
+            self._missing.pop(cpf, None)
+
+    def _drop(self, cpf: str) -> None:
+        entry = self._customers.pop(cpf, None)
+        if entry is not None:
+            self._cpf_by_id.pop(entry[0].customer_id, None)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._customers.clear()
+        self._cpf_by_id.clear()
+        self._missing.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "negativeHits": self.negative_hits,
+            "misses": self.misses,
+            "size": len(self._customers),
+            "negativeSize": len(self._missing),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl_seconds,
+            "negativeTtlSeconds": self.negative_ttl_seconds,
+        }
+
+
+customer_cache = CustomerCpfCache(
+    settings.CUSTOMER_CACHE_MAX_SIZE,
+    settings.CUSTOMER_CACHE_TTL_SECONDS,
+    settings.CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS,
+)
+
+
+@instrument("cache")
+class CachedCustomerRepository(ICustomerGateway):
+    def __init__(self, customer_repo: ICustomerGateway, cache: CustomerCpfCache = customer_cache) -> None:
+        self._customer_repo = customer_repo
+        self._cache = cache
+
+    async def get_by_id(self, customer_id: uuid.UUID) -> Optional[Customer]:
+        return await self._customer_repo.get_by_id(customer_id)
+
+    async def get_by_cpf(self, cpf: str) -> Optional[Customer]:
+        customer = self._cache.get(cpf)
+        if customer is not None:
+            self._cache.hits += 1
+            return customer
+        if self._cache.is_missing(cpf):
+            self._cache.negative_hits += 1
+            return None
+
+        self._cache.misses += 1
+        version = self._cache.version
+        customer = await self._customer_repo.get_by_cpf(cpf)
+        if customer:
+            self._cache.put(customer, version)
+        else:
+            self._cache.put_missing(cpf, version)
+        return customer
+
+    async def get_all(self) -> List[Customer]:
+        return await self._customer_repo.get_all()
+
+    async def create(self, customer_in: Customer) -> Customer:
+        new_customer = await self._customer_repo.create(customer_in)
+        self._cache.invalidate(cpf=new_customer.cpf, customer_id=new_customer.customer_id)
+        return new_customer
+
+    async def update(
+        self, customer_id: uuid.UUID, customer_in: Customer, changed_fields: Optional[Sequence[str]] = None
+    ) -> Customer:
+        updated_customer = await self._customer_repo.update(customer_id, customer_in, changed_fields)
+        self._cache.invalidate(cpf=customer_in.cpf, customer_id=customer_id)
+        return updated_customer
+
+    async def remove(self, customer_id: uuid.UUID) -> None:
+        await self._customer_repo.remove(customer_id)
+        self._cache.invalidate(customer_id=customer_id)
@@ -0,0 +1,153 @@
+import asyncio
+import bisect
+import copy
+import datetime
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import settings
+from src.entities.models.order_entity import Order, OrderStatus
+from src.external.postgresql_database import reading_from_primary
+from src.gateways.memory_gateways.order_event_broker import OrderEventBroker, order_events
+from src.interfaces.gateways.kitchen_queue_gateway_interface import IKitchenQueueGateway
+from src.interfaces.gateways.order_gateway_interface import IOrderGateway
+from src.utils.request_timing import instrument
+
+# Same priority as the CASE sort in PostgresDBOrderRepository.list_ongoing_orders
+KITCHEN_PRIORITY = (OrderStatus.READY, OrderStatus.IN_PROGRESS, OrderStatus.CONFIRMED)
+
+
+def queue_position(order: Order) -> Tuple[datetime.datetime, uuid.UUID]:
+    # Within a status, the same creation_date, order_id order the database query returns
+    return order.creation_date, order.order_id
+
+
+class KitchenQueue:
+    def __init__(self, max_age_seconds: int, broker: OrderEventBroker) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._broker = broker
+        self._buckets: Dict[str, Dict[uuid.UUID, Order]] = {status: {} for status in KITCHEN_PRIORITY}
+        # Sorted queue_position of every order in each bucket
+        self._positions: Dict[str, List[Tuple[datetime.datetime, uuid.UUID]]] = {
+            status: [] for status in KITCHEN_PRIORITY
+        }
+        self._status_by_id: Dict[uuid.UUID, str] = {}
+        self._changes: Optional[Dict[uuid.UUID, Order]] = None
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        # Created lazily so it binds to the running event loop, not the import-time one
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age_seconds
+
+    def begin_reload(self) -> None:
+        self._changes = {}
+
+    def cancel_reload(self) -> None:
+        self._changes = None
+
+    def load(self, orders: List[Order]) -> None:
+        changes = self._changes or {}
+        previous = {order_id: self._buckets[status][order_id] for order_id, status in self._status_by_id.items()}
+        self._buckets = {status: {} for status in KITCHEN_PRIORITY}
+        self._positions = {status: [] for status in KITCHEN_PRIORITY}
+        self._status_by_id = {}
+        self._changes = None
+
+        for order in orders:
+            self._apply(order)
+        # Transitions committed while the snapshot query was running are newer than the snapshot
+        for order in changes.values():
+            self._apply(order)
+        self._loaded_at = time.monotonic()
+
+        # Transitions made by other workers only show up here, so they are published as well
+        for order_id, status in self._status_by_id.items():
+            order = self._buckets[status][order_id]
+            if previous.pop(order_id, None) != order:
+                self._broker.publish_changed(order)
+        for order_id in previous:
+            self._broker.publish_removed(order_id)
+
+    def upsert(self, order: Order) -> None:
+        order = copy.copy(order)
+        if self._changes is not None:
+            self._changes[order.order_id] = order
+        self._apply(order)
+
+        if order.order_id in self._status_by_id:
+            self._broker.publish_changed(order)
+        else:
+            self._broker.publish_removed(order.order_id)
+
+    def _apply(self, order: Order) -> None:
+        current_status = self._status_by_id.pop(order.order_id, None)
+        if current_status:
+            current = self._buckets[current_status].pop(order.order_id)
+            positions = self._positions[current_status]
+            del positions[bisect.bisect_left(positions, queue_position(current))]
+
+        if order.order_status in self._buckets:
+            self._buckets[order.order_status][order.order_id] = order
+            bisect.insort(self._positions[order.order_status], queue_position(order))
+            self._status_by_id[order.order_id] = order.order_status
+
+    def snapshot(self) -> List[Order]:
+        return [
+            copy.copy(self._buckets[status][order_id])
+            for status in KITCHEN_PRIORITY
+            for _, order_id in self._positions[status]
+        ]
+
+    def stats(self) -> dict:
+        age = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+        return {
+            "size": len(self._status_by_id),
+            "ageSeconds": age,
+            "maxAgeSeconds": self.max_age_seconds,
+        }
+
+
+kitchen_queue = KitchenQueue(settings.KITCHEN_QUEUE_MAX_AGE_SECONDS, order_events)
+
+
+@instrument("cache")
+class KitchenQueueRepository(IKitchenQueueGateway):
+    def __init__(self, order_repo: IOrderGateway, queue: Optional[KitchenQueue] = None) -> None:
+        self._order_repo = order_repo
+        # Looked up per call rather than bound as a default, so tests can swap the module's queue
+        self._queue = queue if queue is not None else kitchen_queue
+
+    async def list_ongoing_orders(self) -> List[Order]:
+        if not self._queue.is_fresh():
+            # The reconcile task is not running or has fallen behind; rebuild from the database.
+            # Pollers that queued on the lock behind the one that reloaded find the queue fresh again.
+            async with self._queue.lock:
+                if not self._queue.is_fresh():
+                    await self._reload()
+        return self._queue.snapshot()
+
+    async def order_changed(self, order: Order) -> None:
+        self._queue.upsert(order)
+
+    async def reconcile(self) -> None:
+        async with self._queue.lock:
+            await self._reload()
+
+    async def _reload(self) -> None:
+        self._queue.begin_reload()
+        try:
+            # A lagging replica could roll back changes the queue has already applied
+            with reading_from_primary():
+                orders = await self._order_repo.list_ongoing_orders()
+        except Exception:
+            self._queue.cancel_reload()
+            raise
+        self._queue.load(orders)
@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+from typing import Optional, Set, Tuple
+
+from src.adapters.order_json_adapter import order_serializer, order_to_json
+from src.config.config import settings
+from src.entities.models.order_entity import Order
+
+OrderEvent = Optional[Tuple[str, str]]
+
+
+class OrderEventBroker:
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Set["asyncio.Queue[OrderEvent]"] = set()
+
+    def subscribe(self) -> "asyncio.Queue[OrderEvent]":
+        subscriber: "asyncio.Queue[OrderEvent]" = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: "asyncio.Queue[OrderEvent]") -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish_changed(self, order: Order) -> None:
+        if self._subscribers:
+            self._publish("order_changed", order_to_json(order))
+
+    def publish_removed(self, order_id: uuid.UUID) -> None:
+        if self._subscribers:
+            self._publish("order_removed", {"orderId": order_id})
+
+    def _publish(self, event: str, result: dict) -> None:
+        # Serialized once and shared by every connected screen
+        message = order_serializer.dumps({"event": event, "result": result}).decode()
+
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait((event, message))
+            except asyncio.QueueFull:
+                # A screen that cannot keep up is disconnected and will resync from a fresh snapshot
+                self._subscribers.discard(subscriber)
+                while not subscriber.empty():
+                    subscriber.get_nowait()
+                subscriber.put_nowait(None)
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self._subscribers)}
+
+
+order_events = OrderEventBroker(settings.ORDER_STREAM_QUEUE_SIZE)
@@ -0,0 +1,157 @@
+import asyncio
+import copy
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+from src.config.config import settings
+from src.entities.models.product_entity import Product
+from src.interfaces.gateways.product_gateway_interface import IProductGateway
+from src.utils.request_timing import instrument
+from src.utils.utils import entities_digest
+
+
+class ProductCatalogCache:
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation, i.e. every product write made through this process
+        self.version = 0
+        self._by_id: Dict[uuid.UUID, Product] = {}
+        self._by_category: Dict[str, List[Product]] = {}
+        self._digests: Dict[Optional[str], str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        # Created lazily so it binds to the running event loop, not the import-time one
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def load(self, products: List[Product]) -> None:
+        by_id: Dict[uuid.UUID, Product] = {}
+        by_category: Dict[str, List[Product]] = {}
+        for product in products:
+            by_id[product.product_id] = product
+            by_category.setdefault(product.category, []).append(product)
+
+        # Digests are computed once per load, not per request
+        digests: Dict[Optional[str], str] = {
+            category: entities_digest(sorted(items, key=lambda product: product.product_id))
+            for category, items in by_category.items()
+        }
+        digests[None] = entities_digest(sorted(products, key=lambda product: product.product_id))
+
+        self._by_id = by_id
+        self._by_category = by_category
+        self._digests = digests
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._loaded_at = None
+
+    def digest(self, category: Optional[str] = None) -> str:
+        return self._digests.get(category) or entities_digest([])
+
+    def get(self, product_id: uuid.UUID) -> Optional[Product]:
+        product = self._by_id.get(product_id)
+        return copy.copy(product) if product else None
+
+    def all(self) -> List[Product]:
+        return [copy.copy(product) for product in self._by_id.values()]
+
+    def by_category(self, category: str) -> List[Product]:
+        return [copy.copy(product) for product in self._by_category.get(category, [])]
+
+    def stats(self) -> dict:
+        age = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._by_id),
+            "version": self.version,
+            "ageSeconds": age,
+            "ttlSeconds": self.ttl_seconds,
+        }
+
+
+catalog_cache = ProductCatalogCache(settings.PRODUCT_CACHE_TTL_SECONDS)
+
+
+@instrument("cache")
+class CachedProductRepository(IProductGateway):
+    def __init__(self, product_repo: IProductGateway, cache: ProductCatalogCache = catalog_cache) -> None:
+        self._product_repo = product_repo
+        self._cache = cache
+
+    async def _catalog(self) -> ProductCatalogCache:
+        if self._cache.is_fresh():
+            self._cache.hits += 1
+            return self._cache
+
+        async with self._cache.lock:
+            if not self._cache.is_fresh():
+                self._cache.misses += 1
+                self._cache.load(await self._product_repo.get_all())
+            else:
+                self._cache.hits += 1
+        return self._cache
+
+    async def get_by_id(self, product_id: uuid.UUID) -> Optional[Product]:
+        catalog = await self._catalog()
+        product = catalog.get(product_id)
+        if product:
+            return product
+
+        # Products created by another worker are not visible here until the cache expires
+        self._cache.misses += 1
+        return await self._product_repo.get_by_id(product_id)
+
+    async def get_by_ids(self, product_ids: List[uuid.UUID]) -> List[Product]:
+        catalog = await self._catalog()
+        products = []
+        missing_ids = []
+        for product_id in product_ids:
+            product = catalog.get(product_id)
+            if product:
+                products.append(product)
+            else:
+                missing_ids.append(product_id)
+
+        if missing_ids:
+            self._cache.misses += 1
+            products.extend(await self._product_repo.get_by_ids(missing_ids))
+        return products
+
+    async def get_all(self) -> List[Product]:
+        catalog = await self._catalog()
+        return catalog.all()
+
+    async def get_all_by_category(self, category: str) -> List[Product]:
+        catalog = await self._catalog()
+        return catalog.by_category(category)
+
+    async def get_catalog_digest(self, category: Optional[str] = None) -> str:
+        catalog = await self._catalog()
+        return catalog.digest(category)
+
+    async def create(self, product_in: Product) -> Product:
+        new_product = await self._product_repo.create(product_in)
+        self._cache.invalidate()
+        return new_product
+
+    async def update(self, product_in: Product, changed_fields: Optional[Sequence[str]] = None) -> Product:
+        updated_product = await self._product_repo.update(product_in, changed_fields)
+        self._cache.invalidate()
+        return updated_product
+
+    async def remove(self, product_id: uuid.UUID) -> None:
+        await self._product_repo.remove(product_id)
+        self._cache.invalidate()
@@ -5,7 +5,7 @@ from src.external.postgresql_database import Base
 
 class Customers(Base):
     customer_id = Column(UUID, primary_key=True, index=True)
-    cpf = Column(String(14), nullable=True)
+    cpf = Column(String(14), nullable=True, unique=True, index=True)
     first_name = Column(String(30), nullable=True)
     last_name = Column(String(30), nullable=True)
     email = Column(String(80), nullable=True)
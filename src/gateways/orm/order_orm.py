@@ -1,4 +1,4 @@
-from sqlalchemy import Column, UUID, String, func, DateTime, DECIMAL, Integer
+from sqlalchemy import Column, UUID, String, func, DateTime, DECIMAL, Integer, Index
 
 from src.external.postgresql_database import Base
 
@@ -11,6 +11,10 @@ class Orders(Base):
     order_status = Column(String(30), nullable=False)
     payment_status = Column(String(30), nullable=False)
 
+    __table_args__ = (
+        Index("idx_orders_creation_date_order_id", "creation_date", "order_id"),
+    )
+
 
 class Order_Items(Base):
     order_id = Column(UUID, primary_key=True, nullable=False)
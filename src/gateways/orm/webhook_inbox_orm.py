@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Integer, Index
+
+from src.external.postgresql_database import Base
+
+
+class Webhook_Inbox(Base):
+    resource = Column(String(255), primary_key=True)
+    topic = Column(String(30), nullable=False)
+    status = Column(String(20), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    received_at = Column(DateTime(timezone=True), nullable=False)
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("idx_webhook_inbox_status_available_at", "status", "available_at"),
+    )
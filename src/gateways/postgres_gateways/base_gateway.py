@@ -0,0 +1,51 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.external.postgresql_database import ReplicaSessionLocal, SessionLocal, mark_replica_down, \
+    mark_replica_up, pin_primary, replica_available
+
+
+class PostgresDBRepository:
+    def __init__(self, session: Optional[AsyncSession] = None) -> None:
+        self._session = session
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        if self._session is not None:
+            yield self._session
+        else:
+            async with SessionLocal() as db:
+                yield db
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        # A bound session or an earlier write in this request keeps reads on the primary
+        if self._session is not None or not replica_available():
+            async with self.session() as db:
+                yield db
+            return
+
+        async with ReplicaSessionLocal() as replica_db:  # type: ignore
+            try:
+                await replica_db.connection()
+            except (DBAPIError, OSError) as er:
+                print(er)
+                mark_replica_down()
+            else:
+                mark_replica_up()
+                yield replica_db
+                return
+
+        async with SessionLocal() as db:
+            yield db
+
+    async def commit(self, db: AsyncSession) -> None:
+        pin_primary()
+        # Inside a unit of work the owner of the session decides when to commit
+        if self._session is not None:
+            await db.flush()
+        else:
+            await db.commit()
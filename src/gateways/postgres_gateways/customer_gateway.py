@@ -1,23 +1,17 @@
 import uuid
-from typing import List, Optional, Type
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import List, Optional, Sequence, Type
+from sqlalchemy import select, update
 
-from src.config.config import settings
 from src.entities.models.customer_entity import Customer, customer_factory
 from src.gateways.orm.customer_orm import Customers
+from src.gateways.postgres_gateways.base_gateway import PostgresDBRepository
 from src.interfaces.gateways.customer_gateway_interface import ICustomerGateway
+from src.utils.request_timing import instrument
+from src.utils.utils import entity_to_dict
 
-connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
 
-engine = create_engine(
-    connection_uri
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-class PostgresDBCustomerRepository(ICustomerGateway):
+@instrument("gateway")
+class PostgresDBCustomerRepository(PostgresDBRepository, ICustomerGateway):
     @staticmethod
     def to_entity(customer: Type[Customers]) -> Customer:
         customer = customer_factory(
@@ -30,61 +24,72 @@ class PostgresDBCustomerRepository(ICustomerGateway):
         )
         return customer
 
-    def get_by_id(self, customer_id: uuid.UUID) -> Optional[Customer]:
-        with SessionLocal() as db:
-            result = db.query(Customers).filter(Customers.customer_id == customer_id).first()
+    async def get_by_id(self, customer_id: uuid.UUID) -> Optional[Customer]:
+        async with self.read_session() as db:
+            result = await db.scalar(select(Customers).filter(Customers.customer_id == customer_id))
         if result:
             return self.to_entity(result)
         else:
             return None
 
-    def get_by_cpf(self, cpf: str) -> Optional[Customer]:
-        with SessionLocal() as db:
-            result = db.query(Customers).filter(Customers.cpf == cpf).first()
+    async def get_by_cpf(self, cpf: str) -> Optional[Customer]:
+        async with self.read_session() as db:
+            result = await db.scalar(select(Customers).filter(Customers.cpf == cpf))
         if result:
             return self.to_entity(result)
         else:
             return None
 
-    def get_all(self) -> List[Customer]:
+    async def get_all(self) -> List[Customer]:
         customers = []
 
-        with SessionLocal() as db:
-            result = db.query(Customers).all()
+        async with self.read_session() as db:
+            result = await db.scalars(select(Customers))
 
         for customer in result:
             customers.append(self.to_entity(customer))
 
         return customers
 
-    def create(self, obj_in: Customer) -> Customer:
-        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+    async def create(self, obj_in: Customer) -> Customer:
+        obj_in_data = entity_to_dict(obj_in)
         db_obj = Customers(**obj_in_data)  # type: ignore
 
-        with SessionLocal() as db:
+        async with self.session() as db:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await self.commit(db)
+            await db.refresh(db_obj)
 
         new_customer = self.to_entity(db_obj)  # type: ignore
         return new_customer
 
-    def update(self, customer_id: uuid.UUID, obj_in: Customer) -> Customer:
-        customer_in = vars(obj_in)
-        with SessionLocal() as db:
-            db_obj = db.query(Customers).filter(Customers.customer_id == customer_id).first()
-            obj_data = jsonable_encoder(db_obj, by_alias=False)
-            for field in obj_data:
-                if field in customer_in:
-                    setattr(db_obj, field, customer_in[field])
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-        updated_customer = self.to_entity(db_obj)
-        return updated_customer
-
-    def remove(self, customer_id: uuid.UUID) -> None:
-        with SessionLocal() as db:
-            db_obj = db.query(Customers).filter(Customers.customer_id == customer_id).first()
-            db.delete(db_obj)
-            db.commit()
+    async def update(
+        self, customer_id: uuid.UUID, obj_in: Customer, changed_fields: Optional[Sequence[str]] = None
+    ) -> Optional[Customer]:
+        customer_in = entity_to_dict(obj_in)
+        customer_in.pop("customer_id")
+        if changed_fields is not None:
+            customer_in = {field: customer_in[field] for field in changed_fields}
+        if not customer_in:
+            return await self.get_by_id(customer_id)
+
+        async with self.session() as db:
+            db_obj = (await db.execute(
+                update(Customers)
+                .filter(Customers.customer_id == customer_id)
+                .values(customer_in)
+                .returning(*Customers.__table__.columns)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await self.commit(db)
+
+        if db_obj:
+            return self.to_entity(db_obj)  # type: ignore
+        else:
+            return None
+
+    async def remove(self, customer_id: uuid.UUID) -> None:
+        async with self.session() as db:
+            db_obj = await db.scalar(select(Customers).filter(Customers.customer_id == customer_id))
+            await db.delete(db_obj)
+            await self.commit(db)
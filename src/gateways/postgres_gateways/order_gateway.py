@@ -1,25 +1,25 @@
+import datetime
 import uuid
-from typing import List, Optional
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import create_engine, case
-from sqlalchemy.orm import sessionmaker
-
-from src.config.config import settings
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, case, delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entities.models.order_entity import order_factory, Order, OrderStatus
 from src.entities.models.order_item_entity import OrderItem, order_item_factory
 from src.gateways.orm.order_orm import Order_Items, Orders
+from src.gateways.postgres_gateways.base_gateway import PostgresDBRepository
 from src.interfaces.gateways.order_gateway_interface import IOrderGateway
+from src.utils.request_timing import instrument
+from src.utils.utils import entity_to_dict
 
-connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
 
-engine = create_engine(
-    connection_uri
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ORDER_UPDATE_FIELDS = ("order_total", "order_status", "payment_status")
 
 
-class PostgresDBOrderRepository(IOrderGateway):
+@instrument("gateway")
+class PostgresDBOrderRepository(PostgresDBRepository, IOrderGateway):
     @staticmethod
     def item_to_entity(order_item: Order_Items) -> OrderItem:
         return order_item_factory(order_item.order_id, order_item.product_id, order_item.product_quantity)
@@ -49,10 +49,29 @@ class PostgresDBOrderRepository(IOrderGateway):
         )
         return order
 
-    def get_by_id(self, order_id: uuid.UUID) -> Optional[Order]:
-        with SessionLocal() as db:
-            order_db = db.query(Orders).filter(Orders.order_id == order_id).first()
-            items_db = db.query(Order_Items).filter(Order_Items.order_id == order_id).all()
+    async def orders_to_entity(self, db: AsyncSession, orders: List[Orders]) -> List[Order]:
+        items_by_order = await self.load_items_by_order(db, [order.order_id for order in orders])  # type: ignore
+        return [
+            self.order_to_entity(order, items_by_order.get(order.order_id, []))  # type: ignore
+            for order in orders
+        ]
+
+    async def load_items_by_order(
+        self, db: AsyncSession, order_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, List[OrderItem]]:
+        items_by_order: Dict[uuid.UUID, List[OrderItem]] = defaultdict(list)
+        if not order_ids:
+            return items_by_order
+
+        items_db = await db.scalars(select(Order_Items).filter(Order_Items.order_id.in_(order_ids)))
+        for item in items_db:
+            items_by_order[item.order_id].append(self.item_to_entity(item))  # type: ignore
+        return items_by_order
+
+    async def get_by_id(self, order_id: uuid.UUID) -> Optional[Order]:
+        async with self.read_session() as db:
+            order_db = await db.scalar(select(Orders).filter(Orders.order_id == order_id))
+            items_db = (await db.scalars(select(Order_Items).filter(Order_Items.order_id == order_id))).all()
 
         if items_db:
             items = self.items_to_entity(items_db)  # type: ignore
@@ -64,123 +83,193 @@ class PostgresDBOrderRepository(IOrderGateway):
         else:
             return None
 
-    def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Optional[OrderItem]:
-        with SessionLocal() as db:
-            item_db = db.query(Order_Items)\
+    async def get_by_id_for_update(self, order_id: uuid.UUID) -> Optional[Order]:
+        # Outside a unit of work the session closes right after the select, releasing the lock at once
+        if self._session is None:
+            raise RuntimeError("get_by_id_for_update needs a unit of work session to hold the row lock")
+        async with self.session() as db:
+            order_db = await db.scalar(select(Orders).filter(Orders.order_id == order_id).with_for_update())
+            if not order_db:
+                return None
+            items_db = (await db.scalars(select(Order_Items).filter(Order_Items.order_id == order_id))).all()
+
+        return self.order_to_entity(order_db, self.items_to_entity(items_db))  # type: ignore
+
+    async def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Optional[OrderItem]:
+        async with self.session() as db:
+            item_db = await db.scalar(
+                select(Order_Items)
                 .filter(Order_Items.order_id == order_id,
-                        Order_Items.product_id == product_id)\
-                .first()
+                        Order_Items.product_id == product_id)
+            )
 
             if item_db:
                 return self.item_to_entity(item_db)  # type: ignore
             else:
                 return None
 
-    def get_all(self) -> List[Order]:
-        result = []
-        with SessionLocal() as db:
-            orders = db.query(Orders).order_by(Orders.creation_date).all()
-            if orders:
-                for order in orders:
-                    items_db = db.query(Order_Items).filter(Order_Items.order_id == order.order_id).all()  # type: ignore
-                    items = self.items_to_entity(items_db)  # type: ignore
-                    order_entity = self.order_to_entity(order, items)  # type: ignore
-                    result.append(order_entity)
+    async def get_all(self) -> List[Order]:
+        async with self.read_session() as db:
+            orders = (await db.scalars(select(Orders).order_by(Orders.creation_date))).all()
+            result = await self.orders_to_entity(db, orders)  # type: ignore
         return result
 
-    def list_ongoing_orders(self) -> List[Order]:
-        result = []
-        with SessionLocal() as db:
-            orders = db.query(Orders)\
+    async def get_page(self, limit: int, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None) -> List[Order]:
+        async with self.read_session() as db:
+            statement = select(Orders)
+            if after:
+                statement = statement.filter(tuple_(Orders.creation_date, Orders.order_id) > tuple_(*after))
+            statement = statement.order_by(Orders.creation_date, Orders.order_id).limit(limit)
+            orders = (await db.scalars(statement)).all()
+            result = await self.orders_to_entity(db, orders)  # type: ignore
+        return result
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[Order]:
+        async with self.session() as db:
+            statement = select(Orders)\
+                .order_by(Orders.creation_date, Orders.order_id)\
+                .execution_options(yield_per=batch_size)
+            result = await db.stream_scalars(statement)
+            async for orders in result.partitions():
+                for order in await self.orders_to_entity(db, orders):  # type: ignore
+                    yield order
+
+    async def list_ongoing_orders(self) -> List[Order]:
+        async with self.read_session() as db:
+            statement = select(Orders)\
                 .filter(Orders.order_status.not_in(['Finalizado', 'Pendente']))\
                 .order_by(case(
                         (Orders.order_status == OrderStatus.READY, 1),  # type: ignore
                         (Orders.order_status == OrderStatus.IN_PROGRESS, 2),  # type: ignore
                         (Orders.order_status == OrderStatus.CONFIRMED, 3),  # type: ignore
-                        else_=4))\
-                .all()
-
-            if orders:
-                for order in orders:
-                    items_db = db.query(Order_Items).filter(Order_Items.order_id == order.order_id).all()  # type: ignore
-                    items = self.items_to_entity(items_db)  # type: ignore
-                    order_entity = self.order_to_entity(order, items)  # type: ignore
-                    result.append(order_entity)
+                        else_=4), Orders.creation_date, Orders.order_id)
+            orders = (await db.scalars(statement)).all()
+            result = await self.orders_to_entity(db, orders)  # type: ignore
         return result
 
-    def create_order(self, obj_in: Order) -> Order:
-        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+    async def create_order(self, obj_in: Order) -> Order:
+        obj_in_data = entity_to_dict(obj_in)
         obj_in_data.pop("order_items")
         db_obj = Orders(**obj_in_data)  # type: ignore
 
-        with SessionLocal() as db:
+        async with self.session() as db:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await self.commit(db)
+            await db.refresh(db_obj)
 
         new_order = self.order_to_entity(db_obj, list())
         return new_order
 
-    def create_order_item(self, obj_in: Order_Items) -> List[OrderItem]:
-        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+    async def create_order_item(self, obj_in: OrderItem) -> List[OrderItem]:
+        obj_in_data = entity_to_dict(obj_in)
         db_obj = Order_Items(**obj_in_data)  # type: ignore
 
-        with SessionLocal() as db:
+        async with self.session() as db:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await self.commit(db)
 
         item_list = [db_obj]
         return self.items_to_entity(item_list)
 
-    def update_item(self, obj_in: OrderItem):
-        item_in = vars(obj_in)
-        with SessionLocal() as db:
-            db_obj = db.query(Order_Items)\
+    async def upsert_order_items(self, items_in: List[OrderItem]) -> None:
+        if not items_in:
+            return
+
+        statement = insert(Order_Items).values([
+            {"order_id": item.order_id, "product_id": item.product_id, "product_quantity": item.product_quantity}
+            for item in items_in
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[Order_Items.order_id, Order_Items.product_id],
+            set_={"product_quantity": statement.excluded.product_quantity},
+        )
+        async with self.session() as db:
+            await db.execute(statement)
+            await self.commit(db)
+
+    async def update_item(self, obj_in: OrderItem) -> Optional[OrderItem]:
+        async with self.session() as db:
+            item_db = (await db.execute(
+                update(Order_Items)
                 .filter(Order_Items.order_id == obj_in.order_id,
-                        Order_Items.product_id == obj_in.product_id).first()
-            obj_data = jsonable_encoder(db_obj, by_alias=False)
-            for field in obj_data:
-                if field in item_in:
-                    setattr(db_obj, field, item_in[field])
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-            print(self.items_to_entity([db_obj]))  # type: ignore
-
-    def update(self, order_id: uuid.UUID, obj_in: Order) -> Order:
-        order_in = vars(obj_in)
-        with SessionLocal() as db:
-            db_obj = db.query(Orders).filter(Orders.order_id == order_id).first()
-            obj_data = jsonable_encoder(db_obj, by_alias=False)
-            for field in obj_data:
-                if field in order_in:
-                    setattr(db_obj, field, order_in[field])
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-
-        with SessionLocal() as db:
-            items_db = db.query(Order_Items).filter(Order_Items.order_id == order_id).all()
-
-        items = self.items_to_entity(items_db)  # type: ignore
-        updated_order = self.order_to_entity(db_obj, items)  # type: ignore
-        return updated_order
-
-    def remove_order(self, order_id: uuid.UUID) -> None:
-        with SessionLocal() as db:
-            order = db.query(Orders).filter(Orders.order_id == order_id).first()
-            db.delete(order)
-
-            items = db.query(Order_Items).filter(Order_Items.order_id == order_id).all()
-            for item in items:
-                db.delete(item)
-            db.commit()
-
-    def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
-        with SessionLocal() as db:
-            item = db.query(Order_Items).filter(Order_Items.order_id == order_id).filter(
-                Order_Items.product_id == product_id).first()
-            db.delete(item)
-            db.commit()
+                        Order_Items.product_id == obj_in.product_id)
+                .values(product_quantity=obj_in.product_quantity)
+                .returning(*Order_Items.__table__.columns)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await self.commit(db)
+
+        if item_db:
+            return self.item_to_entity(item_db)  # type: ignore
+        else:
+            return None
+
+    async def update(
+        self, order_id: uuid.UUID, obj_in: Order, changed_fields: Optional[Sequence[str]] = None
+    ) -> Optional[Order]:
+        values = {field: getattr(obj_in, field) for field in changed_fields or ORDER_UPDATE_FIELDS}
+        async with self.session() as db:
+            order_db = (await db.execute(
+                update(Orders)
+                .filter(Orders.order_id == order_id)
+                .values(values)
+                .returning(*Orders.__table__.columns)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await self.commit(db)
+
+        if order_db:
+            # Items are written separately and the caller's list already reflects them
+            return self.order_to_entity(order_db, obj_in.order_items)  # type: ignore
+        else:
+            return None
+
+    async def remove_order(self, order_id: uuid.UUID) -> None:
+        await self.remove_orders([order_id])
+
+    async def remove_orders(self, order_ids: List[uuid.UUID], order_status: Optional[str] = None) -> List[uuid.UUID]:
+        if not order_ids:
+            return []
+
+        doomed = select(Orders.order_id).filter(Orders.order_id.in_(order_ids))
+        if order_status:
+            doomed = doomed.filter(Orders.order_status == order_status)
+        # Locking re-checks the status, so an order confirmed meanwhile is left alone
+        doomed = doomed.with_for_update()
+        return await self._remove_selected_orders(doomed)
+
+    async def remove_stale_orders(
+        self, order_status: str, created_before: datetime.datetime, limit: int
+    ) -> List[uuid.UUID]:
+        doomed = select(Orders.order_id)\
+            .filter(Orders.order_status == order_status,
+                    Orders.creation_date < created_before)\
+            .order_by(Orders.creation_date)\
+            .limit(limit)\
+            .with_for_update(skip_locked=True)
+        return await self._remove_selected_orders(doomed)
+
+    async def _remove_selected_orders(self, doomed: Select) -> List[uuid.UUID]:
+        # Items and orders go in one statement; the FK check runs at its end, after both deletes
+        doomed_cte = doomed.cte("doomed_orders")
+        deleted_items = delete(Order_Items)\
+            .filter(Order_Items.order_id.in_(select(doomed_cte.c.order_id)))\
+            .cte("deleted_items")
+        statement = delete(Orders)\
+            .filter(Orders.order_id.in_(select(doomed_cte.c.order_id)))\
+            .add_cte(deleted_items)\
+            .returning(Orders.order_id)\
+            .execution_options(synchronize_session=False)
+
+        async with self.session() as db:
+            removed = (await db.scalars(statement)).all()
+            await self.commit(db)
+        return list(removed)
+
+    async def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
+        async with self.session() as db:
+            item = await db.scalar(select(Order_Items).filter(Order_Items.order_id == order_id).filter(
+                Order_Items.product_id == product_id))
+            await db.delete(item)
+            await self.commit(db)
 
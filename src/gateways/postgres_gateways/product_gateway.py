@@ -1,24 +1,17 @@
 import uuid
-from typing import List, Optional
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from src.config.config import settings
+from typing import List, Optional, Sequence
+from sqlalchemy import select, update
 
 from src.entities.models.product_entity import product_factory, Product
 from src.gateways.orm.product_orm import Products
+from src.gateways.postgres_gateways.base_gateway import PostgresDBRepository
 from src.interfaces.gateways.product_gateway_interface import IProductGateway
-
-connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
-
-engine = create_engine(
-    connection_uri
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from src.utils.request_timing import instrument
+from src.utils.utils import entities_digest, entity_to_dict
 
 
-class PostgresDBProductRepository(IProductGateway):
+@instrument("gateway")
+class PostgresDBProductRepository(PostgresDBRepository, IProductGateway):
     @staticmethod
     def to_entity(product: Products) -> Product:
         product = product_factory(
@@ -31,62 +24,84 @@ class PostgresDBProductRepository(IProductGateway):
         )
         return product
 
-    def get_by_id(self, product_id: uuid.UUID) -> Optional[Product]:
-        with SessionLocal() as db:
-            result = db.query(Products).filter(Products.product_id == product_id).first()
+    async def get_by_id(self, product_id: uuid.UUID) -> Optional[Product]:
+        async with self.read_session() as db:
+            result = await db.scalar(select(Products).filter(Products.product_id == product_id))
         if result:
             return self.to_entity(result)
         else:
             return None
 
-    def get_all(self) -> List[Product]:
+    async def get_by_ids(self, product_ids: List[uuid.UUID]) -> List[Product]:
+        if not product_ids:
+            return []
+
+        async with self.read_session() as db:
+            result = await db.scalars(select(Products).filter(Products.product_id.in_(product_ids)))
+
+        return [self.to_entity(product) for product in result]
+
+    async def get_all(self) -> List[Product]:
         products = []
 
-        with SessionLocal() as db:
-            result = db.query(Products).all()
+        async with self.read_session() as db:
+            result = await db.scalars(select(Products))
 
         for product in result:
             products.append(self.to_entity(product))
         return products
 
-    def get_all_by_category(self, category: str) -> List[Product]:
+    async def get_all_by_category(self, category: str) -> List[Product]:
         products = []
 
-        with SessionLocal() as db:
-            result = db.query(Products).filter(Products.category == category).all()
+        async with self.read_session() as db:
+            result = await db.scalars(select(Products).filter(Products.category == category))
 
         for product in result:
             products.append(self.to_entity(product))
         return products
 
-    def create(self, obj_in: Product) -> Product:
-        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+    async def get_catalog_digest(self, category: Optional[str] = None) -> str:
+        products = await self.get_all_by_category(category) if category else await self.get_all()
+        return entities_digest(sorted(products, key=lambda product: product.product_id))
+
+    async def create(self, obj_in: Product) -> Product:
+        obj_in_data = entity_to_dict(obj_in)
         db_obj = Products(**obj_in_data)  # type: ignore
 
-        with SessionLocal() as db:
+        async with self.session() as db:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await self.commit(db)
+            await db.refresh(db_obj)
 
         new_product = self.to_entity(db_obj)
         return new_product
 
-    def update(self, obj_in: Product) -> Product:
-        product_in = vars(obj_in)
-        with SessionLocal() as db:
-            db_obj = db.query(Products).filter(Products.product_id == obj_in.product_id).first()
-            obj_data = jsonable_encoder(db_obj, by_alias=False)
-            for field in obj_data:
-                if field in product_in:
-                    setattr(db_obj, field, product_in[field])
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-        updated_product = self.to_entity(db_obj)
-        return updated_product
-
-    def remove(self, product_id: uuid.UUID) -> None:
-        with SessionLocal() as db:
-            db_obj = db.query(Products).filter(Products.product_id == product_id).first()
-            db.delete(db_obj)
-            db.commit()
+    async def update(self, obj_in: Product, changed_fields: Optional[Sequence[str]] = None) -> Optional[Product]:
+        product_in = entity_to_dict(obj_in)
+        product_in.pop("product_id")
+        if changed_fields is not None:
+            product_in = {field: product_in[field] for field in changed_fields}
+        if not product_in:
+            return await self.get_by_id(obj_in.product_id)
+
+        async with self.session() as db:
+            db_obj = (await db.execute(
+                update(Products)
+                .filter(Products.product_id == obj_in.product_id)
+                .values(product_in)
+                .returning(*Products.__table__.columns)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await self.commit(db)
+
+        if db_obj:
+            return self.to_entity(db_obj)  # type: ignore
+        else:
+            return None
+
+    async def remove(self, product_id: uuid.UUID) -> None:
+        async with self.session() as db:
+            db_obj = await db.scalar(select(Products).filter(Products.product_id == product_id))
+            await db.delete(db_obj)
+            await self.commit(db)
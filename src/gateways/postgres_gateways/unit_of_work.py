@@ -0,0 +1,36 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.external.postgresql_database import SessionLocal, pin_primary
+from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
+from src.gateways.postgres_gateways.product_gateway import PostgresDBProductRepository
+from src.interfaces.gateways.unit_of_work_interface import IUnitOfWork
+from src.utils.request_timing import instrument
+
+
+@instrument("gateway")
+class PostgresDBUnitOfWork(IUnitOfWork):
+    def __init__(self) -> None:
+        self._session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> "PostgresDBUnitOfWork":
+        self._session = SessionLocal()
+        await self._session.begin()
+        self.orders = PostgresDBOrderRepository(self._session)
+        self.products = PostgresDBProductRepository(self._session)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            await self.rollback()
+        finally:
+            await self._session.close()  # type: ignore
+            self._session = None
+
+    async def commit(self) -> None:
+        pin_primary()
+        await self._session.commit()  # type: ignore
+
+    async def rollback(self) -> None:
+        await self._session.rollback()  # type: ignore
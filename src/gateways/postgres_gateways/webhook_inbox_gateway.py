@@ -0,0 +1,128 @@
+import datetime
+from typing import List
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.entities.models.webhook_notification_entity import NotificationStatus, WebhookNotification, \
+    webhook_notification_factory
+from src.gateways.orm.webhook_inbox_orm import Webhook_Inbox
+from src.gateways.postgres_gateways.base_gateway import PostgresDBRepository
+from src.interfaces.gateways.webhook_inbox_gateway_interface import IWebhookInboxGateway
+from src.utils.request_timing import instrument
+
+
+def utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@instrument("gateway")
+class PostgresDBWebhookInboxRepository(PostgresDBRepository, IWebhookInboxGateway):
+    @staticmethod
+    def to_entity(notification: Webhook_Inbox) -> WebhookNotification:
+        return webhook_notification_factory(
+            notification.resource,  # type: ignore
+            notification.topic,  # type: ignore
+            notification.received_at,  # type: ignore
+            notification.attempts,  # type: ignore
+        )
+
+    async def enqueue(self, topic: str, resource: str) -> None:
+        now = utc_now()
+        statement = insert(Webhook_Inbox).values(
+            resource=resource,
+            topic=topic,
+            status=NotificationStatus.PENDING,
+            attempts=0,
+            received_at=now,
+            available_at=now,
+        )
+        # Repeated notifications for the same resource collapse into one row that is processed again,
+        # unless the payment it carries was already applied
+        statement = statement.on_conflict_do_update(
+            index_elements=[Webhook_Inbox.resource],
+            set_={
+                "status": NotificationStatus.PENDING,
+                "attempts": 0,
+                "received_at": now,
+                "available_at": now,
+                "last_error": None,
+            },
+            where=Webhook_Inbox.status != NotificationStatus.DONE,
+        )
+        async with self.session() as db:
+            await db.execute(statement)
+            await self.commit(db)
+
+    async def claim(self, batch_size: int, visibility_timeout: int) -> List[WebhookNotification]:
+        now = utc_now()
+        async with self.session() as db:
+            rows = (await db.scalars(
+                select(Webhook_Inbox)
+                .filter(Webhook_Inbox.status == NotificationStatus.PENDING,
+                        Webhook_Inbox.available_at <= now)
+                .order_by(Webhook_Inbox.available_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return []
+
+            notifications = [self.to_entity(row) for row in rows]  # type: ignore
+            # Hidden from other workers until the timeout, so a crashed worker's claim is picked up again
+            await db.execute(
+                update(Webhook_Inbox)
+                .filter(Webhook_Inbox.resource.in_([notification.resource for notification in notifications]))
+                .values(available_at=now + datetime.timedelta(seconds=visibility_timeout),
+                        attempts=Webhook_Inbox.attempts + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await self.commit(db)
+
+        for notification in notifications:
+            notification.attempts += 1
+        return notifications
+
+    async def complete(self, notification: WebhookNotification) -> None:
+        await self._update_claimed(notification, status=NotificationStatus.DONE, last_error=None)
+
+    async def skip(self, notification: WebhookNotification) -> None:
+        await self._update_claimed(notification, status=NotificationStatus.SKIPPED, last_error=None)
+
+    async def retry(self, notification: WebhookNotification, delay: float, error: str) -> None:
+        await self._update_claimed(
+            notification,
+            available_at=utc_now() + datetime.timedelta(seconds=delay),
+            last_error=error[:255],
+        )
+
+    async def fail(self, notification: WebhookNotification, error: str) -> None:
+        await self._update_claimed(notification, status=NotificationStatus.FAILED, last_error=error[:255])
+
+    async def _update_claimed(self, notification: WebhookNotification, **values) -> None:
+        # A notification received while this one was being processed resets the row; leave it pending
+        async with self.session() as db:
+            await db.execute(
+                update(Webhook_Inbox)
+                .filter(Webhook_Inbox.resource == notification.resource,
+                        Webhook_Inbox.received_at == notification.received_at)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await self.commit(db)
+
+    async def stats(self) -> dict:
+        async with self.session() as db:
+            pending, oldest = (await db.execute(
+                select(func.count(), func.min(Webhook_Inbox.received_at))
+                .filter(Webhook_Inbox.status == NotificationStatus.PENDING)
+            )).one()
+            failed = await db.scalar(
+                select(func.count()).filter(Webhook_Inbox.status == NotificationStatus.FAILED)
+            )
+
+        return {
+            "depth": pending,
+            "lagSeconds": (utc_now() - oldest).total_seconds() if oldest else 0.0,
+            "failed": failed,
+        }
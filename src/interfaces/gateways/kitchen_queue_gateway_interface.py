@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from src.entities.models.order_entity import Order
+
+
+class IKitchenQueueGateway(ABC):
+    @abstractmethod
+    async def list_ongoing_orders(self) -> List[Order]:
+        pass
+
+    @abstractmethod
+    async def order_changed(self, order: Order) -> None:
+        pass
+
+    @abstractmethod
+    async def reconcile(self) -> None:
+        pass
@@ -1,6 +1,7 @@
+import datetime
 import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
 from src.entities.models.order_entity import Order
 from src.entities.models.order_item_entity import OrderItem
@@ -8,41 +9,69 @@ from src.entities.models.order_item_entity import OrderItem
 
 class IOrderGateway(ABC):
     @abstractmethod
-    def get_by_id(self, order_id: uuid.UUID) -> Order:
+    async def get_by_id(self, order_id: uuid.UUID) -> Order:
         pass
 
     @abstractmethod
-    def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> OrderItem:
+    async def get_by_id_for_update(self, order_id: uuid.UUID) -> Order:
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Order]:
+    async def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> OrderItem:
         pass
 
     @abstractmethod
-    def list_ongoing_orders(self) -> List[Order]:
+    async def get_all(self) -> List[Order]:
         pass
 
     @abstractmethod
-    def create_order(self, order_in: Order) -> Order:
+    async def get_page(self, limit: int, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None) -> List[Order]:
         pass
 
     @abstractmethod
-    def create_order_item(self, item_in: OrderItem) -> Order:
+    def stream_all(self, batch_size: int) -> AsyncIterator[Order]:
         pass
 
     @abstractmethod
-    def update(self, order_id: uuid.UUID, order_in: Order) -> Order:
+    async def list_ongoing_orders(self) -> List[Order]:
         pass
 
     @abstractmethod
-    def update_item(self, obj_in: OrderItem):
+    async def create_order(self, order_in: Order) -> Order:
         pass
 
     @abstractmethod
-    def remove_order(self, order_id: uuid.UUID) -> None:
+    async def create_order_item(self, item_in: OrderItem) -> Order:
         pass
 
     @abstractmethod
-    def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
+    async def upsert_order_items(self, items_in: List[OrderItem]) -> None:
+        pass
+
+    @abstractmethod
+    async def update(
+        self, order_id: uuid.UUID, order_in: Order, changed_fields: Optional[Sequence[str]] = None
+    ) -> Order:
+        pass
+
+    @abstractmethod
+    async def update_item(self, obj_in: OrderItem) -> OrderItem:
+        pass
+
+    @abstractmethod
+    async def remove_order(self, order_id: uuid.UUID) -> None:
+        pass
+
+    @abstractmethod
+    async def remove_orders(self, order_ids: List[uuid.UUID], order_status: Optional[str] = None) -> List[uuid.UUID]:
+        pass
+
+    @abstractmethod
+    async def remove_stale_orders(
+        self, order_status: str, created_before: datetime.datetime, limit: int
+    ) -> List[uuid.UUID]:
+        pass
+
+    @abstractmethod
+    async def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
         pass
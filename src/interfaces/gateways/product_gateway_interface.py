@@ -1,31 +1,39 @@
 import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Sequence
 
 from src.entities.models.product_entity import Product
 
 
 class IProductGateway(ABC):
     @abstractmethod
-    def get_by_id(self, product_id: uuid.UUID) -> Product:
+    async def get_by_id(self, product_id: uuid.UUID) -> Product:
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Product]:
+    async def get_by_ids(self, product_ids: List[uuid.UUID]) -> List[Product]:
         pass
 
     @abstractmethod
-    def get_all_by_category(self, category: str) -> List[Product]:
+    async def get_all(self) -> List[Product]:
         pass
 
     @abstractmethod
-    def create(self, product_in: Product) -> Product:
+    async def get_all_by_category(self, category: str) -> List[Product]:
         pass
 
     @abstractmethod
-    def update(self, product_in: Product) -> Product:
+    async def get_catalog_digest(self, category: Optional[str] = None) -> str:
         pass
 
     @abstractmethod
-    def remove(self, product_id: uuid.UUID) -> None:
+    async def create(self, product_in: Product) -> Product:
+        pass
+
+    @abstractmethod
+    async def update(self, product_in: Product, changed_fields: Optional[Sequence[str]] = None) -> Product:
+        pass
+
+    @abstractmethod
+    async def remove(self, product_id: uuid.UUID) -> None:
         pass
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+from src.interfaces.gateways.order_gateway_interface import IOrderGateway
+from src.interfaces.gateways.product_gateway_interface import IProductGateway
+
+
+class IUnitOfWork(ABC):
+    orders: IOrderGateway
+    products: IProductGateway
+
+    async def __aenter__(self) -> "IUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
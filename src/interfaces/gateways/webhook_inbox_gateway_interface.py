@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from src.entities.models.webhook_notification_entity import WebhookNotification
+
+
+class IWebhookInboxGateway(ABC):
+    @abstractmethod
+    async def enqueue(self, topic: str, resource: str) -> None:
+        pass
+
+    @abstractmethod
+    async def claim(self, batch_size: int, visibility_timeout: int) -> List[WebhookNotification]:
+        pass
+
+    @abstractmethod
+    async def complete(self, notification: WebhookNotification) -> None:
+        pass
+
+    @abstractmethod
+    async def skip(self, notification: WebhookNotification) -> None:
+        pass
+
+    @abstractmethod
+    async def retry(self, notification: WebhookNotification, delay: float, error: str) -> None:
+        pass
+
+    @abstractmethod
+    async def fail(self, notification: WebhookNotification, error: str) -> None:
+        pass
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        pass
@@ -10,17 +10,17 @@ class CustomerUseCaseInterface(ABC):
     def __init__(self, customer_repo: ICustomerGateway) -> None:
         raise NotImplementedError
 
-    def get_by_id(self, customer_id: uuid.UUID):
+    async def get_by_id(self, customer_id: uuid.UUID):
         pass
 
-    def get_all(self):
+    async def get_all(self):
         pass
 
-    def create(self, input_dto: CreateCustomerDTO) -> Customer:
+    async def create(self, input_dto: CreateCustomerDTO) -> Customer:
         pass
 
-    def update(self, customer_id: uuid.UUID, input_dto: ChangeCustomerDTO) -> Customer:
+    async def update(self, customer_id: uuid.UUID, input_dto: ChangeCustomerDTO) -> Customer:
         pass
 
-    def remove(self, customer_id: uuid.UUID) -> None:
+    async def remove(self, customer_id: uuid.UUID) -> None:
         pass
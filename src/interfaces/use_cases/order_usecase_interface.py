@@ -1,5 +1,7 @@
+import datetime
 import uuid
 from abc import ABC
+from typing import AsyncIterator, List, Optional, Tuple
 
 from src.entities.models.order_entity import Order, PaymentStatus
 from src.entities.models.order_item_entity import OrderItem
@@ -11,44 +13,59 @@ class OrderUseCaseInterface(ABC):
     def __init__(self, order_repo: IOrderGateway) -> None:
         raise NotImplementedError
 
-    def get_by_id(self, order_id: uuid.UUID):
+    async def get_by_id(self, order_id: uuid.UUID):
         pass
 
-    def get_all(self):
+    async def get_all(self):
         pass
 
-    def list_ongoing_orders(self):
+    async def get_page(self, limit: int, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None) -> List[Order]:
         pass
 
-    def create_order(self, input_dto: CreateOrderDTO) -> Order:
+    def stream_all(self) -> AsyncIterator[Order]:
         pass
 
-    def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> OrderItem:
+    async def list_ongoing_orders(self):
         pass
 
-    def add_item(self, order_id: uuid.UUID, input_dto: CreateOrderItemDTO) -> Order:
+    async def create_order(self, input_dto: CreateOrderDTO) -> Order:
         pass
 
-    def remove_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Order:
+    async def get_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> OrderItem:
         pass
 
-    def confirm_order(self, order_id: uuid.UUID) -> Order:
+    async def add_item(self, order_id: uuid.UUID, input_dto: CreateOrderItemDTO) -> Order:
         pass
 
-    def confirm_payment(self, order_id: uuid.UUID, status: str) -> Order:
+    async def create_order_items(self, order_id: uuid.UUID, input_dtos: List[CreateOrderItemDTO]) -> Order:
         pass
 
-    def change_order_status_in_progress(self, order_id: uuid.UUID) -> Order:
+    async def remove_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Order:
         pass
 
-    def change_order_status_ready(self, order_id: uuid.UUID) -> Order:
+    async def confirm_order(self, order_id: uuid.UUID) -> Order:
         pass
 
-    def change_order_status_finalized(self, order_id: uuid.UUID) -> Order:
+    async def confirm_payment(self, order_id: uuid.UUID, status: str) -> Order:
         pass
 
-    def remove_order(self, order_id: uuid.UUID) -> None:
+    async def change_order_status_in_progress(self, order_id: uuid.UUID) -> Order:
         pass
 
-    def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
+    async def change_order_status_ready(self, order_id: uuid.UUID) -> Order:
+        pass
+
+    async def change_order_status_finalized(self, order_id: uuid.UUID) -> Order:
+        pass
+
+    async def remove_order(self, order_id: uuid.UUID) -> None:
+        pass
+
+    async def remove_orders(self, order_ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        pass
+
+    async def remove_abandoned_orders(self, older_than: datetime.timedelta) -> int:
+        pass
+
+    async def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> None:
         pass
@@ -1,5 +1,6 @@
 import uuid
 from abc import ABC
+from typing import List, Optional, Tuple
 
 from src.entities.models.product_entity import Product
 from src.entities.schemas.product_dto import CreateProductDTO, ChangeProductDTO
@@ -10,20 +11,29 @@ class ProductUseCaseInterface(ABC):
     def __init__(self, product_repo: IProductGateway) -> None:
         raise NotImplementedError
 
-    def get_by_id(self, product_id: uuid.UUID):
+    async def get_by_id(self, product_id: uuid.UUID):
         pass
 
-    def get_all(self):
+    async def get_catalog_etag(self, category: Optional[str] = None) -> str:
         pass
 
-    def get_all_by_category(self, category: str):
+    async def get_by_id_with_etag(self, product_id: uuid.UUID) -> Tuple[Product, str]:
         pass
 
-    def create(self, input_dto: CreateProductDTO) -> Product:
+    async def get_by_ids(self, product_ids: List[uuid.UUID]) -> List[Product]:
         pass
 
-    def update(self, product_id: uuid.UUID, input_dto: ChangeProductDTO) -> Product:
+    async def get_all(self):
         pass
 
-    def remove(self, product_id: uuid.UUID) -> None:
+    async def get_all_by_category(self, category: str):
+        pass
+
+    async def create(self, input_dto: CreateProductDTO) -> Product:
+        pass
+
+    async def update(self, product_id: uuid.UUID, input_dto: ChangeProductDTO) -> Product:
+        pass
+
+    async def remove(self, product_id: uuid.UUID) -> None:
         pass
@@ -0,0 +1,91 @@
+import glob
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from src.config.config import settings
+
+
+class AppUvicornWorker(UvicornWorker):
+    # Leave the worker time to run the lifespan shutdown (DB pools, HTTP client) before gunicorn kills it
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "timeout_graceful_shutdown": max(settings.SERVER_GRACEFUL_TIMEOUT - 5, 1),
+    }
+
+
+def cgroup_cpu_limit() -> Optional[int]:
+    # Containers see every host CPU, the quota is what the pod may actually use
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return max(int(quota) // int(period), 1)
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS:
+        return settings.SERVER_WORKERS
+
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def prepare_metrics_dir() -> str:
+    # Workers share their Prometheus samples through this directory; it must be set before they import the client
+    metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="prometheus-"))
+    os.makedirs(metrics_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(stale)
+    return metrics_dir
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+class Server(BaseApplication):
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)  # type: ignore
+
+    def load(self) -> Any:
+        from src.app import app
+        return app
+
+
+def main() -> None:
+    prepare_metrics_dir()
+    options = {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": worker_count(),
+        "worker_class": AppUvicornWorker,
+        "timeout": settings.SERVER_TIMEOUT,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "accesslog": "-",
+        "child_exit": child_exit,
+    }
+    Server(options).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,112 +1,221 @@
+import datetime
 import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from src.config.config import settings
 from src.config.errors import ResourceNotFound
 
 from src.entities.schemas.order_dto import CreateOrderDTO, UpdateOrderItemDTO, CreateOrderItemDTO
-from src.entities.models.order_entity import Order, PaymentStatus
+from src.entities.models.order_entity import Order, OrderStatus, PaymentStatus
 from src.entities.models.order_item_entity import OrderItem
+from src.interfaces.gateways.kitchen_queue_gateway_interface import IKitchenQueueGateway
 from src.interfaces.gateways.order_gateway_interface import IOrderGateway
 from src.interfaces.gateways.product_gateway_interface import IProductGateway
+from src.interfaces.gateways.unit_of_work_interface import IUnitOfWork
 from src.interfaces.use_cases.order_usecase_interface import OrderUseCaseInterface
+from src.utils.request_timing import instrument
 
 
+@instrument("usecase")
 class OrderUseCase(OrderUseCaseInterface):
-    def __init__(self, order_repo: IOrderGateway, product_repo: IProductGateway) -> None:
+    def __init__(
+        self,
+        order_repo: IOrderGateway,
+        product_repo: IProductGateway,
+        uow: IUnitOfWork,
+        kitchen_queue: IKitchenQueueGateway
+    ) -> None:
         self._order_repo = order_repo
         self._product_repo = product_repo
+        self._uow = uow
+        self._kitchen_queue = kitchen_queue
 
-    def get_by_id(self, order_id: uuid.UUID):
-        result = self._order_repo.get_by_id(order_id)
+    async def get_by_id(self, order_id: uuid.UUID):
+        result = await self._order_repo.get_by_id(order_id)
         if not result:
             raise ResourceNotFound
         else:
             return result
 
-    def get_all(self):
-        return self._order_repo.get_all()
+    async def get_all(self):
+        return await self._order_repo.get_all()
 
-    def list_ongoing_orders(self):
-        return self._order_repo.list_ongoing_orders()
+    async def get_page(self, limit: int, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None) -> List[Order]:
+        return await self._order_repo.get_page(limit, after)
 
-    def create_order(self, input_dto: CreateOrderDTO) -> Order:
+    def stream_all(self) -> AsyncIterator[Order]:
+        return self._order_repo.stream_all(settings.ORDER_EXPORT_BATCH_SIZE)
+
+    async def list_ongoing_orders(self):
+        return await self._kitchen_queue.list_ongoing_orders()
+
+    async def create_order(self, input_dto: CreateOrderDTO) -> Order:
         order = Order.create_new_order(input_dto.customer_id)
-        self._order_repo.create_order(order)
+        await self._order_repo.create_order(order)
         return order
 
-    def update_quantity(self, order_id: uuid.UUID, input_dto: UpdateOrderItemDTO) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        item = OrderItem.create(order_id, input_dto.product_id, input_dto.product_quantity)
-        product = self._product_repo.get_by_id(input_dto.product_id)
+    async def update_quantity(self, order_id: uuid.UUID, input_dto: UpdateOrderItemDTO) -> Order:
+        # Prices are resolved before the order row is locked, so a catalog reload never runs on a second
+        # pooled connection while the unit of work holds its connection and the lock
+        product = await self._product_repo.get_by_id(input_dto.product_id)
 
-        order.update_item_quantity(item, product.price)
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            item = OrderItem.create(order_id, input_dto.product_id, input_dto.product_quantity)
 
-        self._order_repo.update_item(item)
-        updated_order = self._order_repo.update(order_id, order)
+            order.update_item_quantity(item, product.price)
+
+            await uow.orders.update_item(item)
+            updated_order = await uow.orders.update(order_id, order, ["order_total"])
+            await uow.commit()
         return updated_order
 
-    def create_order_item(self, order_id: uuid.UUID, input_dto: CreateOrderItemDTO) -> Order:
-        item = self._order_repo.get_order_item(order_id, input_dto.product_id)
+    async def create_order_item(self, order_id: uuid.UUID, input_dto: CreateOrderItemDTO) -> Order:
+        product = await self._product_repo.get_by_id(input_dto.product_id)
 
-        if item:
-            update_dto = UpdateOrderItemDTO(
-                order_id=order_id,
-                product_id=input_dto.product_id,
-                product_quantity=input_dto.product_quantity + item.product_quantity
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            current_item = next(
+                (item for item in order.order_items if item.product_id == input_dto.product_id), None
             )
-            return self.update_quantity(order_id, update_dto)
-
-        order = self._order_repo.get_by_id(order_id)
-        item = OrderItem.create(order_id, input_dto.product_id, input_dto.product_quantity)
-        product = self._product_repo.get_by_id(input_dto.product_id)
-
-        order.add_order_item(item, product.price)
-
-        self._order_repo.create_order_item(item)
-        self._order_repo.update(order_id, order)
-        return order
 
-    def confirm_order(self, order_id: uuid.UUID) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        order.confirm_order()
-        updated_order = self._order_repo.update(order_id, order)
+            if current_item:
+                item = OrderItem.create(
+                    order_id, input_dto.product_id, input_dto.product_quantity + current_item.product_quantity
+                )
+                order.update_item_quantity(item, product.price)
+                await uow.orders.update_item(item)
+            else:
+                item = OrderItem.create(order_id, input_dto.product_id, input_dto.product_quantity)
+                order.add_order_item(item, product.price)
+                await uow.orders.create_order_item(item)
+
+            updated_order = await uow.orders.update(order_id, order, ["order_total"])
+            await uow.commit()
         return updated_order
 
-    def confirm_payment(self, order_id: uuid.UUID, status: str) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        order.confirm_payment(status)
-        updated_order = self._order_repo.update(order_id, order)
+    async def create_order_items(self, order_id: uuid.UUID, input_dtos: List[CreateOrderItemDTO]) -> Order:
+        quantities: Dict[uuid.UUID, int] = {}
+        for input_dto in input_dtos:
+            quantities[input_dto.product_id] = quantities.get(input_dto.product_id, 0) + input_dto.product_quantity
+
+        products = {
+            product.product_id: product for product in await self._product_repo.get_by_ids(list(quantities))
+        }
+
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+
+            items = []
+            for product_id, quantity in quantities.items():
+                product = products.get(product_id)
+                if not product:
+                    raise ResourceNotFound
+
+                current_item = next((item for item in order.order_items if item.product_id == product_id), None)
+                if current_item:
+                    item = OrderItem.create(order_id, product_id, quantity + current_item.product_quantity)
+                    order.update_item_quantity(item, product.price)
+                else:
+                    item = OrderItem.create(order_id, product_id, quantity)
+                    order.add_order_item(item, product.price)
+                items.append(item)
+
+            await uow.orders.upsert_order_items(items)
+            updated_order = await uow.orders.update(order_id, order, ["order_total"])
+            await uow.commit()
         return updated_order
 
-    def change_order_status_in_progress(self, order_id: uuid.UUID) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        order.order_in_progress()
-        updated_order = self._order_repo.update(order_id, order)
+    async def confirm_order(self, order_id: uuid.UUID) -> Order:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.confirm_order()
+            updated_order = await uow.orders.update(order_id, order, ["order_status"])
+            await uow.commit()
+        await self._kitchen_queue.order_changed(updated_order)
         return updated_order
 
-    def change_order_status_ready(self, order_id: uuid.UUID) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        order.order_ready()
-        updated_order = self._order_repo.update(order_id, order)
+    async def confirm_payment(self, order_id: uuid.UUID, status: str) -> Order:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.confirm_payment(status)
+            updated_order = await uow.orders.update(order_id, order, ["payment_status"])
+            await uow.commit()
+        await self._kitchen_queue.order_changed(updated_order)
         return updated_order
 
-    def change_order_status_finalized(self, order_id: uuid.UUID) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        order.order_finalized()
-        updated_order = self._order_repo.update(order_id, order)
+    async def change_order_status_in_progress(self, order_id: uuid.UUID) -> Order:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.order_in_progress()
+            updated_order = await uow.orders.update(order_id, order, ["order_status"])
+            await uow.commit()
+        await self._kitchen_queue.order_changed(updated_order)
         return updated_order
 
-    def remove_order(self, order_id: uuid.UUID) -> None:
-        order = self._order_repo.get_by_id(order_id)
-        order.check_if_pending_order()
-        self._order_repo.remove_order(order_id)
-
-    def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Order:
-        order = self._order_repo.get_by_id(order_id)
-        item = self._order_repo.get_order_item(order_id, product_id)
-        product = self._product_repo.get_by_id(product_id)
+    async def change_order_status_ready(self, order_id: uuid.UUID) -> Order:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.order_ready()
+            updated_order = await uow.orders.update(order_id, order, ["order_status"])
+            await uow.commit()
+        await self._kitchen_queue.order_changed(updated_order)
+        return updated_order
 
-        order.remove_order_item(item, product.price)
+    async def change_order_status_finalized(self, order_id: uuid.UUID) -> Order:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.order_finalized()
+            updated_order = await uow.orders.update(order_id, order, ["order_status"])
+            await uow.commit()
+        await self._kitchen_queue.order_changed(updated_order)
+        return updated_order
 
-        self._order_repo.remove_order_item(order_id, product_id)
-        updated_order = self._order_repo.update(order_id, order)
+    async def remove_order(self, order_id: uuid.UUID) -> None:
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            order.check_if_pending_order()
+            await uow.orders.remove_order(order_id)
+            await uow.commit()
+
+    async def remove_orders(self, order_ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        # Only orders still pending may be removed, the same rule remove_order applies one at a time
+        batch_size = settings.ORDER_BULK_DELETE_BATCH_SIZE
+        removed = []
+        for start in range(0, len(order_ids), batch_size):
+            removed.extend(
+                await self._order_repo.remove_orders(order_ids[start:start + batch_size], OrderStatus.PENDING)
+            )
+        return removed
+
+    async def remove_abandoned_orders(self, older_than: datetime.timedelta) -> int:
+        created_before = datetime.datetime.utcnow() - older_than
+        batch_size = settings.ORDER_BULK_DELETE_BATCH_SIZE
+        removed = 0
+        while True:
+            # One short transaction per chunk, so no lock is held across the whole cleanup
+            chunk = await self._order_repo.remove_stale_orders(OrderStatus.PENDING, created_before, batch_size)
+            removed += len(chunk)
+            if len(chunk) < batch_size:
+                return removed
+
+    async def remove_order_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Order:
+        product = await self._product_repo.get_by_id(product_id)
+
+        async with self._uow as uow:
+            order = await self._get_locked_order(uow, order_id)
+            item = next((item for item in order.order_items if item.product_id == product_id), None)
+
+            order.remove_order_item(item, product.price)
+
+            await uow.orders.remove_order_item(order_id, product_id)
+            updated_order = await uow.orders.update(order_id, order, ["order_total"])
+            await uow.commit()
         return updated_order
+
+    @staticmethod
+    async def _get_locked_order(uow: IUnitOfWork, order_id: uuid.UUID) -> Order:
+        order = await uow.orders.get_by_id_for_update(order_id)
+        if not order:
+            raise ResourceNotFound
+        return order
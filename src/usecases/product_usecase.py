@@ -1,4 +1,5 @@
 import uuid
+from typing import List, Optional, Tuple
 
 from src.config.errors import ResourceNotFound
 from src.entities.models.product_entity import Product
@@ -6,27 +7,43 @@ from src.entities.schemas.product_dto import CreateProductDTO, ChangeProductDTO
 from src.interfaces.gateways.order_gateway_interface import IOrderGateway
 from src.interfaces.gateways.product_gateway_interface import IProductGateway
 from src.interfaces.use_cases.product_usecase_interface import ProductUseCaseInterface
+from src.utils.request_timing import instrument
+from src.utils.utils import entities_digest
 
 
+@instrument("usecase")
 class ProductUseCase(ProductUseCaseInterface):
     def __init__(self, order_repo: IOrderGateway, product_repo: IProductGateway) -> None:
         self._order_repo = order_repo
         self._product_repo = product_repo
 
-    def get_by_id(self, product_id: uuid.UUID):
-        result = self._product_repo.get_by_id(product_id)
+    async def get_by_id(self, product_id: uuid.UUID):
+        result = await self._product_repo.get_by_id(product_id)
         if not result:
             raise ResourceNotFound
         else:
             return result
 
-    def get_all(self):
-        return self._product_repo.get_all()
+    async def get_catalog_etag(self, category: Optional[str] = None) -> str:
+        if category:
+            category = category.lower().capitalize()
+        return f'"{await self._product_repo.get_catalog_digest(category)}"'
 
-    def get_all_by_category(self, category: str):
-        return self._product_repo.get_all_by_category(category.lower().capitalize())
+    async def get_by_id_with_etag(self, product_id: uuid.UUID) -> Tuple[Product, str]:
+        # The ETag is derived from the product being returned, so one lookup serves both
+        product = await self.get_by_id(product_id)
+        return product, f'"{entities_digest([product])}"'
 
-    def create(self, input_dto: CreateProductDTO) -> Product:
+    async def get_by_ids(self, product_ids: List[uuid.UUID]) -> List[Product]:
+        return await self._product_repo.get_by_ids(product_ids)
+
+    async def get_all(self):
+        return await self._product_repo.get_all()
+
+    async def get_all_by_category(self, category: str):
+        return await self._product_repo.get_all_by_category(category.lower().capitalize())
+
+    async def create(self, input_dto: CreateProductDTO) -> Product:
         product = Product.create(
             input_dto.name,
             input_dto.description,
@@ -34,24 +51,30 @@ class ProductUseCase(ProductUseCaseInterface):
             input_dto.price,
             input_dto.image_url,
         )
-        self._product_repo.create(product)
+        await self._product_repo.create(product)
         return product
 
-    def update(self, product_id: uuid.UUID, input_dto: ChangeProductDTO) -> Product:
-        product = self._product_repo.get_by_id(product_id)
+    async def update(self, product_id: uuid.UUID, input_dto: ChangeProductDTO) -> Product:
+        product = await self._product_repo.get_by_id(product_id)
+        changed_fields = []
         if input_dto.name:
             product.change_product_name(input_dto.name)
+            changed_fields.append("name")
         if input_dto.description:
             product.change_product_description(input_dto.description)
+            changed_fields.append("description")
         if input_dto.category:
             product.change_product_category(input_dto.category)
+            changed_fields.append("category")
         if input_dto.price:
             product.change_price(input_dto.price)
+            changed_fields.append("price")
         if input_dto.image_url:
             product.change_image_url(input_dto.image_url)
+            changed_fields.append("image_url")
 
-        updated_product = self._product_repo.update(product)
+        updated_product = await self._product_repo.update(product, changed_fields)
         return updated_product
 
-    def remove(self, product_id: uuid.UUID) -> None:
-        self._product_repo.remove(product_id)
+    async def remove(self, product_id: uuid.UUID) -> None:
+        await self._product_repo.remove(product_id)
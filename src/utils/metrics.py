@@ -0,0 +1,55 @@
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# With PROMETHEUS_MULTIPROC_DIR set (src/server.py does it) every worker writes its samples there
+# and a scrape of any worker aggregates all of them.
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ["method", "route", "status"]
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out.", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size.", ["pool"], multiprocess_mode="livesum"
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement latency by the gateway method that issued it.",
+    ["gateway", "method"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+
+MERCADO_PAGO_REQUEST_DURATION = Histogram(
+    "mercado_pago_request_duration_seconds", "Mercado Pago API latency per attempt.", ["method", "status"]
+)
+MERCADO_PAGO_ERRORS = Counter(
+    "mercado_pago_errors_total", "Mercado Pago attempts that failed or were retried.", ["method", "reason"]
+)
+
+WEBHOOK_NOTIFICATIONS = Counter(
+    "webhook_notifications_total", "Webhook notifications by processing outcome.", ["outcome"]
+)
+# Every worker reads the same inbox table, so the highest live reading is the current one
+WEBHOOK_INBOX_DEPTH = Gauge(
+    "webhook_inbox_depth", "Notifications waiting to be processed.", multiprocess_mode="livemax"
+)
+WEBHOOK_INBOX_LAG = Gauge(
+    "webhook_inbox_lag_seconds", "Age of the oldest notification waiting to be processed.",
+    multiprocess_mode="livemax"
+)
+WEBHOOK_INBOX_FAILED = Gauge(
+    "webhook_inbox_failed", "Notifications that gave up and need attention.", multiprocess_mode="livemax"
+)
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
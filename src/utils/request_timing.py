@@ -0,0 +1,125 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.utils.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_QUERY_DURATION
+
+
+class RequestTiming:
+    """Self time per layer for one sampled request; time spent in a nested layer is charged to that layer only."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.layers: Dict[str, float] = {}
+        self.sql_statements = 0
+        self._stack: List[List[float]] = []
+
+    def enter(self) -> None:
+        # [start, time spent in nested layers]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def exit(self, layer: str) -> None:
+        start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self._charge(layer, elapsed - nested, elapsed)
+
+    def add_sql(self, elapsed: float) -> None:
+        self.sql_statements += 1
+        self._charge("db", elapsed, elapsed)
+
+    def _charge(self, layer: str, self_time: float, elapsed: float) -> None:
+        self.layers[layer] = self.layers.get(layer, 0.0) + self_time
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        metrics = [f"total;dur={self.total() * 1000:.1f}"]
+        for layer, elapsed in self.layers.items():
+            if layer == "db":
+                metrics.append(f'db;dur={elapsed * 1000:.1f};desc="statements={self.sql_statements}"')
+            else:
+                metrics.append(f"{layer};dur={elapsed * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("current_timing", default=None)
+# Innermost instrumented method, e.g. "PostgresDBOrderRepository.get_by_id"; SQL metrics are labelled with it
+current_operation: ContextVar[Optional[str]] = ContextVar("current_operation", default=None)
+
+
+def timed(layer: str, func: Callable) -> Callable:
+    operation = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        operation_token = current_operation.set(operation)
+        timing = current_timing.get()
+        if timing is not None:
+            timing.enter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            if timing is not None:
+                timing.exit(layer)
+            current_operation.reset(operation_token)
+
+    return wrapper
+
+
+def instrument(layer: str) -> Callable[[type], type]:
+    """Class decorator that times every public coroutine method of the class under ``layer``."""
+
+    def decorate(cls: type) -> type:
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(attribute, staticmethod) and inspect.iscoroutinefunction(attribute.__func__):
+                setattr(cls, name, staticmethod(timed(layer, attribute.__func__)))
+            elif inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, timed(layer, attribute))
+        return cls
+
+    return decorate
+
+
+def instrument_engine(engine: AsyncEngine, pool_name: str) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop("query_started", None)
+        if started is None:
+            return
+
+        elapsed = time.perf_counter() - started
+        gateway, _, method = (current_operation.get() or "unknown.unknown").rpartition(".")
+        DB_QUERY_DURATION.labels(gateway, method).observe(elapsed)
+
+        timing = current_timing.get()
+        if timing is not None:
+            timing.add_sql(elapsed)
+
+    # Only QueuePool can overflow; other pools just skip that gauge
+    overflow = getattr(engine.sync_engine.pool, "overflow", None)
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        DB_POOL_CHECKED_OUT.labels(pool_name).inc()
+        if overflow:
+            DB_POOL_OVERFLOW.labels(pool_name).set(max(overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def checkin(dbapi_connection, connection_record) -> None:
+        DB_POOL_CHECKED_OUT.labels(pool_name).dec()
+        if overflow:
+            DB_POOL_OVERFLOW.labels(pool_name).set(max(overflow(), 0))
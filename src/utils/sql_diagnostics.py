@@ -0,0 +1,70 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.config import settings
+from src.utils.request_timing import current_operation
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    # Same shape, different values: IN lists of any length collapse to one placeholder
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryDiagnostics:
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self.counts: Counter = Counter()
+        self.repeated: Dict[str, str] = {}
+
+    def record(self, statement: str, operation: str) -> None:
+        normalized = normalize_statement(statement)
+        self.counts[normalized] += 1
+        if self.counts[normalized] > self.threshold:
+            self.repeated[normalized] = operation
+
+
+current_diagnostics: ContextVar[Optional[QueryDiagnostics]] = ContextVar("current_diagnostics", default=None)
+
+
+def log_event(event_name: str, **fields: Any) -> None:
+    print(orjson.dumps({"event": event_name, **fields}, default=str).decode())
+
+
+def install_sql_diagnostics(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info["diagnostics_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop("diagnostics_started", None)
+        if started is None:
+            return
+
+        operation = current_operation.get() or "unknown"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            log_event(
+                "slow_query",
+                durationMs=round(elapsed_ms, 2),
+                operation=operation,
+                statement=_WHITESPACE.sub(" ", statement).strip(),
+                parameters=repr(parameters)[:settings.SLOW_QUERY_PARAMETERS_MAX_LENGTH],
+            )
+
+        diagnostics = current_diagnostics.get()
+        if diagnostics is not None:
+            diagnostics.record(statement, operation)
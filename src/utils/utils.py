@@ -1,3 +1,10 @@
+import base64
+import binascii
+import datetime
+import hashlib
+import uuid
+from typing import Iterable, Optional, Tuple
+
 from pydantic import BaseModel
 
 
@@ -6,17 +13,31 @@ def camel_string(snake_str):
     return ''.join([first.lower(), *map(str.title, others)])
 
 
-def camelize_dict(snake_dict):
-    new_dict = {}
-    for key, value in snake_dict.items():
-        new_key = camel_string(key)
-        if isinstance(value, list):
-            new_dict[new_key] = list(map(camelize_dict, value))
-        elif isinstance(value, dict):
-            new_dict[new_key] = camelize_dict(value)
-        else:
-            new_dict[new_key] = value
-    return new_dict
+def entity_to_dict(entity) -> dict:
+    # Entities are slotted; __slots__ lists their fields in declaration order
+    return {name: getattr(entity, name) for name in entity.__slots__}
+
+
+def entities_digest(entities: Iterable) -> str:
+    # Content hash, so every worker derives the same value from the same rows
+    digest = hashlib.blake2b(digest_size=16)
+    for entity in entities:
+        digest.update(repr(tuple(entity_to_dict(entity).values())).encode())
+    return digest.hexdigest()
+
+
+def encode_cursor(creation_date: datetime.datetime, record_id: uuid.UUID) -> str:
+    raw = f"{creation_date.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime.datetime, uuid.UUID]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        creation_date, record_id = raw.split("|")
+        return datetime.datetime.fromisoformat(creation_date), uuid.UUID(record_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
 
 
 class CamelModel(BaseModel):
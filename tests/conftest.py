@@ -0,0 +1,131 @@
+import os
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, List
+
+import httpx
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Set before src is imported: settings are read once, and app.py only mounts SqlDiagnosticsMiddleware
+# when SQL_DIAGNOSTICS is on. With ENVIRONMENT=test an N+1 query fails the request, and so the test run.
+os.environ["SQL_DIAGNOSTICS"] = "true"
+os.environ["ENVIRONMENT"] = "test"
+
+from src.app import app  # noqa: E402
+from src.config.config import settings  # noqa: E402
+from src.entities.models.order_entity import OrderStatus, PaymentStatus  # noqa: E402
+from src.external.postgresql_database import Base  # noqa: E402
+from src.gateways.orm.customer_orm import Customers  # noqa: E402
+from src.gateways.orm.order_orm import Order_Items, Orders  # noqa: E402
+from src.gateways.orm.product_orm import Products  # noqa: E402
+from src.gateways.memory_gateways import kitchen_queue_gateway  # noqa: E402
+from src.gateways.memory_gateways.order_event_broker import OrderEventBroker  # noqa: E402
+from src.gateways.memory_gateways.product_cache_gateway import catalog_cache  # noqa: E402
+from src.gateways.postgres_gateways import base_gateway  # noqa: E402
+import src.gateways.orm.webhook_inbox_orm  # noqa: E402, F401
+from src.utils.sql_diagnostics import install_sql_diagnostics  # noqa: E402
+
+ITEMS_PER_ORDER = 3
+
+# These tests run against the PostgreSQL configured in .env (docker compose up -d starts one).
+# Everything they write happens inside one transaction that is rolled back at the end.
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_connection() -> AsyncIterator[AsyncConnection]:
+    engine = create_async_engine(settings.db.SQLALCHEMY_DATABASE_URI, poolclass=NullPool)
+    install_sql_diagnostics(engine)
+    try:
+        connection = await engine.connect()
+    except (DBAPIError, OSError) as er:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL is not reachable: {er}")
+
+    transaction = await connection.begin()
+    try:
+        await connection.run_sync(Base.metadata.create_all)
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(db_connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    # Gateway commits only release a savepoint, the outer transaction is still rolled back
+    async with AsyncSession(
+        bind=db_connection, join_transaction_mode="create_savepoint", autoflush=False, expire_on_commit=False
+    ) as session:
+        yield session
+
+
+@pytest.fixture
+def gateway_sessions(db_connection: AsyncConnection, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Every gateway session joins the test transaction, so the routes see the seeded rows
+    monkeypatch.setattr(base_gateway, "SessionLocal", async_sessionmaker(
+        bind=db_connection, join_transaction_mode="create_savepoint", autoflush=False, expire_on_commit=False
+    ))
+
+
+@pytest.fixture
+async def client(gateway_sessions: None, monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[httpx.AsyncClient]:
+    # A kitchen queue of its own, loaded from this test's transaction on the first /orders/ongoing
+    monkeypatch.setattr(kitchen_queue_gateway, "kitchen_queue", kitchen_queue_gateway.KitchenQueue(
+        settings.KITCHEN_QUEUE_MAX_AGE_SECONDS, OrderEventBroker(settings.ORDER_STREAM_QUEUE_SIZE)
+    ))
+    catalog_cache.invalidate()
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            yield client
+    finally:
+        catalog_cache.invalidate()
+
+
+@pytest.fixture
+def seed_orders(db_session: AsyncSession) -> Callable[[int], Awaitable[List[uuid.UUID]]]:
+    async def seed(count: int) -> List[uuid.UUID]:
+        customer_id = uuid.uuid4()
+        product_ids = [uuid.uuid4() for _ in range(ITEMS_PER_ORDER)]
+        db_session.add(Customers(customer_id=customer_id, cpf=str(customer_id)[:14], first_name="Teste"))
+        db_session.add_all([
+            Products(
+                product_id=product_id,
+                name="Lanche",
+                description="Teste",
+                category="Lanche",
+                price=12.5,
+                image_url="https://example.com/lanche.png",
+            )
+            for product_id in product_ids
+        ])
+        await db_session.flush()
+
+        order_ids = [uuid.uuid4() for _ in range(count)]
+        db_session.add_all([
+            Orders(
+                order_id=order_id,
+                customer_id=customer_id,
+                order_total=12.5 * ITEMS_PER_ORDER,
+                order_status=OrderStatus.CONFIRMED,
+                payment_status=PaymentStatus.CONFIRMED,
+            )
+            for order_id in order_ids
+        ])
+        await db_session.flush()
+        db_session.add_all([
+            Order_Items(order_id=order_id, product_id=product_id, product_quantity=1)
+            for order_id in order_ids
+            for product_id in product_ids
+        ])
+        await db_session.flush()
+        return order_ids
+
+    return seed
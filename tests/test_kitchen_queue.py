@@ -0,0 +1,27 @@
+import datetime
+import uuid
+
+from src.entities.models.order_entity import OrderStatus, PaymentStatus, order_factory
+from src.gateways.memory_gateways.kitchen_queue_gateway import KitchenQueue
+from src.gateways.memory_gateways.order_event_broker import OrderEventBroker
+
+
+def test_moved_orders_keep_creation_date_order() -> None:
+    created = datetime.datetime(2024, 1, 1)
+    orders = [
+        order_factory(
+            uuid.uuid4(), uuid.uuid4(), [], created + datetime.timedelta(minutes=minute), 10.0,
+            OrderStatus.CONFIRMED, PaymentStatus.CONFIRMED,
+        )
+        for minute in range(4)
+    ]
+    queue = KitchenQueue(10, OrderEventBroker(10))
+    queue.load(orders)
+
+    # Moved newest first, so appending would list them in reverse
+    for order in reversed(orders[:3]):
+        order.order_status = OrderStatus.IN_PROGRESS
+        queue.upsert(order)
+
+    assert [order.order_id for order in queue.snapshot()] == [order.order_id for order in orders]
+    assert [order.order_status for order in queue.snapshot()] == [OrderStatus.IN_PROGRESS] * 3 + [OrderStatus.CONFIRMED]
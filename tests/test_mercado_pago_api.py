@@ -0,0 +1,24 @@
+import pytest
+
+from src.entities.errors.webhook_error import WebhookError
+from src.external.mercado_pago_api import MercadoPagoAPI
+
+
+@pytest.mark.parametrize("resource", [
+    "https://api.mercadolibre.com/merchant_orders/12345",
+    "http://evil.example.com/merchant_orders/12345",
+    "/merchant_orders/12345/",
+])
+def test_merchant_order_path_keeps_only_the_order_id(resource: str) -> None:
+    assert MercadoPagoAPI.merchant_order_path(resource) == "/merchant_orders/12345"
+
+
+@pytest.mark.parametrize("resource", [
+    "",
+    "https://evil.example.com/steal",
+    "https://api.mercadolibre.com/merchant_orders/12345/../../users/me",
+    "https://api.mercadolibre.com/payments/12345",
+])
+def test_merchant_order_path_rejects_other_resources(resource: str) -> None:
+    with pytest.raises(WebhookError):
+        MercadoPagoAPI.merchant_order_path(resource)
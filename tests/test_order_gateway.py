@@ -0,0 +1,46 @@
+import uuid
+from typing import Awaitable, Callable, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def count_statements(db: AsyncSession, call: Callable[[], Awaitable[list]]) -> int:
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    sync_engine = (await db.connection()).engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+@pytest.mark.parametrize("method", ["get_all", "list_ongoing_orders"])
+async def test_order_listing_query_count_does_not_grow_with_orders(
+    db_session: AsyncSession, seed_orders: Callable[[int], Awaitable[List[uuid.UUID]]], method: str
+) -> None:
+    listing = getattr(PostgresDBOrderRepository(db_session), method)
+
+    await seed_orders(10)
+    few_orders = await count_statements(db_session, listing)
+
+    await seed_orders(90)
+    many_orders = await count_statements(db_session, listing)
+
+    assert len(await listing()) >= 100
+    assert few_orders == many_orders
+
+
+async def test_row_lock_requires_a_unit_of_work() -> None:
+    with pytest.raises(RuntimeError):
+        await PostgresDBOrderRepository().get_by_id_for_update(uuid.uuid4())
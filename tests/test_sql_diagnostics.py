@@ -0,0 +1,48 @@
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.middlewares.sql_diagnostics_middleware import SqlDiagnosticsMiddleware
+from src.config.config import settings
+from src.config.errors import NPlusOneQueryError
+from src.gateways.postgres_gateways.order_gateway import PostgresDBOrderRepository
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def per_row_client(gateway_sessions: None) -> AsyncIterator[httpx.AsyncClient]:
+    # A route that loads orders one by one, the pattern the detector exists to catch
+    per_row_app = FastAPI()
+    per_row_app.add_middleware(SqlDiagnosticsMiddleware)
+
+    @per_row_app.post("/orders/one-by-one")
+    async def get_orders_one_by_one(order_ids: List[uuid.UUID]) -> int:
+        order_gateway = PostgresDBOrderRepository()
+        return len([await order_gateway.get_by_id(order_id) for order_id in order_ids])
+
+    async with httpx.AsyncClient(app=per_row_app, base_url="http://test") as client:
+        yield client
+
+
+async def test_per_row_queries_fail_the_request(
+    per_row_client: httpx.AsyncClient, seed_orders: Callable[[int], Awaitable[List[uuid.UUID]]]
+) -> None:
+    order_ids = await seed_orders(settings.N_PLUS_ONE_THRESHOLD + 1)
+
+    with pytest.raises(NPlusOneQueryError):
+        await per_row_client.post("/orders/one-by-one", json=[str(order_id) for order_id in order_ids])
+
+
+async def test_batched_order_listing_stays_under_the_threshold(
+    client: httpx.AsyncClient, seed_orders: Callable[[int], Awaitable[List[uuid.UUID]]]
+) -> None:
+    await seed_orders(settings.N_PLUS_ONE_THRESHOLD * 5)
+
+    response = await client.get("/orders")
+
+    assert response.status_code == 200
+    assert len(response.json()["result"]) >= settings.N_PLUS_ONE_THRESHOLD * 5
@@ -0,0 +1,30 @@
+import uuid
+from typing import Awaitable, Callable, List
+
+import httpx
+import pytest
+
+from src.config.config import settings
+
+pytestmark = pytest.mark.anyio
+
+TRUSTED_ROUTES = ["/orders", "/orders/ongoing", "/products", "/products/category/lanche", "/customers"]
+
+
+@pytest.mark.parametrize("route", TRUSTED_ROUTES)
+async def test_trusted_response_matches_validated_response(
+    client: httpx.AsyncClient,
+    seed_orders: Callable[[int], Awaitable[List[uuid.UUID]]],
+    monkeypatch: pytest.MonkeyPatch,
+    route: str,
+) -> None:
+    await seed_orders(3)
+
+    monkeypatch.setattr(settings, "TRUSTED_RESPONSES", False)
+    validated = await client.get(route)
+    monkeypatch.setattr(settings, "TRUSTED_RESPONSES", True)
+    trusted = await client.get(route)
+
+    assert validated.status_code == trusted.status_code == 200
+    assert validated.json()["result"]
+    assert trusted.content == validated.content